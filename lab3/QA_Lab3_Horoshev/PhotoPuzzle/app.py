@@ -0,0 +1,78 @@
+import pygame as pg
+
+
+class AppContext:
+    """
+    Общие ресурсы приложения: одно окно, один таймер и кэш шрифтов.
+
+    Экраны интерфейса и стили не создают окно и шрифты сами, а берут их здесь.
+    Pygame инициализируется один раз, режим окна меняется только при смене размера
+    или флагов (поверхность окна при этом остаётся тем же объектом), а поиск системных
+    шрифтов выполняется один раз для каждой пары (шрифт, размер).
+
+    Attributes:
+        clock (pygame.time.Clock): Общий таймер для управления FPS.
+        fonts (dict): Кэш шрифтов ((имя, размер, жирный) -> pygame.font.Font).
+        mode (tuple or None): Текущий режим окна (размер, флаги).
+    """
+    def __init__(self):
+        pg.init()
+        self.clock = pg.time.Clock()
+        self.fonts = {}
+        self.mode = None
+
+    def display(self, size, flags=0):
+        """
+        Возвращает поверхность окна нужного размера, пересоздавая режим только при изменении.
+
+        Args:
+            size (tuple): Размер окна (ширина, высота).
+            flags (int): Флаги pygame.display.set_mode (по умолчанию 0).
+
+        Returns:
+            pygame.Surface: Поверхность окна.
+        """
+        size = tuple(size)
+        surface = pg.display.get_surface()
+        if surface is None or self.mode != (size, flags) or surface.get_size() != size:
+            surface = pg.display.set_mode(size, flags)
+            self.mode = (size, flags)
+        return surface
+
+    def font(self, size, name=None, bold=False):
+        """
+        Возвращает шрифт из кэша, загружая его при первом обращении.
+
+        Args:
+            size (int): Размер шрифта.
+            name (str, optional): Имя системного шрифта (None — встроенный шрифт pygame).
+            bold (bool): Жирное начертание (по умолчанию False).
+
+        Returns:
+            pygame.font.Font: Шрифт.
+        """
+        key = (name, size, bold)
+        if key not in self.fonts:
+            if name is None:
+                font = pg.font.Font(None, size)
+                font.set_bold(bold)
+            else:
+                font = pg.font.SysFont(name, size, bold=bold)
+            self.fonts[key] = font
+        return self.fonts[key]
+
+
+_context = None
+
+
+def app_context():
+    """
+    Возвращает общий контекст приложения (создаётся при первом обращении).
+
+    Returns:
+        AppContext: Контекст приложения.
+    """
+    global _context
+    if _context is None:
+        _context = AppContext()
+    return _context
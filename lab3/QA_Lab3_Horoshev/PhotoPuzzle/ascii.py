@@ -1,31 +1,47 @@
 import pygame as pg
 import numpy as np
 import cv2
+from loader import load_image
+from cache import default_cache
+from quantize import AdaptivePalette, PALETTE_METHODS
+from app import app_context
+from cached_art import CachedArtMixin
+from bands import run_bands
+from charsets import GRAY_ASCII_CHARS, GRAY_ASCII_COEFF, COLOR_ASCII_CHARS, COLOR_ASCII_COEFF
 
-class ArtASCII:
+class ArtASCII(CachedArtMixin):
     """
     Базовый класс для преобразования изображения в ASCII-стиль.
 
     Args:
-        path (str): Путь к изображению (по умолчанию 'photo/nya.jpg').
+        path (str or None): Путь к изображению (по умолчанию 'photo/nya.jpg'). None — кадры передаются через set_frame.
         font_size (int): Размер шрифта для символов (по умолчанию 10).
         screen_res (tuple): Разрешение экрана (по умолчанию (800, 600)).
+        workers (int, optional): Количество потоков преобразования (None — bands.DEFAULT_WORKERS, 1 — без потоков).
 
     Attributes:
+        app (AppContext): Общий контекст приложения (окно, таймер, шрифты).
         surface (pygame.Surface): Поверхность для отрисовки.
         font (pygame.font.Font): Шрифт для символов ASCII.
         clock (pygame.time.Clock): Объект для управления FPS.
+        cache (ConvertedCache or None): Кэш преобразований (None — кэш отключён).
     """
-    def __init__(self, path='photo/nya.jpg', font_size=10, screen_res=(800, 600)):
-        pg.init()
+    SIZE_PARAM = 'font_size'
+    SIZE_ATTR = 'font_size'
+
+    def __init__(self, path='photo/nya.jpg', font_size=10, screen_res=(800, 600), workers=None):
+        self.app = app_context()
         self.path = path
         self.font_size = font_size
+        self.WORKERS = workers
         self.screen_res = screen_res
         self.RES = self.WIDTH, self.HEIGHT = screen_res
-        self.surface = pg.display.set_mode(self.RES)
-        self.clock = pg.time.Clock()
-        self.font = pg.font.SysFont('Courier', font_size, bold=True)
+        self.surface = self.app.display(self.RES)
+        self.clock = self.app.clock
+        self.font = self.app.font(font_size, 'Courier', bold=True)
         self.CHAR_STEP = int(font_size * 0.6)
+        self.cache = default_cache()
+        self.converted_surface = None
 
     def get_image(self):
         """
@@ -37,24 +53,96 @@ class ArtASCII:
         Raises:
             FileNotFoundError: Если изображение не найдено.
         """
-        self.cv2_image = cv2.imread(self.path, cv2.IMREAD_UNCHANGED)
-        if self.cv2_image is None:
-            raise FileNotFoundError(f"Image at path {self.path} could not be loaded.")
+        self.cv2_image = load_image(self.path, self.screen_res, cv2.IMREAD_UNCHANGED)
         if self.cv2_image.shape[-1] == 4:
             bgra_image = self.cv2_image
             self.cv2_image = cv2.cvtColor(bgra_image, cv2.COLOR_BGRA2BGR)
             print("Alpha channel detected and removed.")
-        return cv2.cvtColor(self.cv2_image, cv2.COLOR_BGR2RGB)
+        return self.convert_frame(self.cv2_image)
 
-    def draw_converted_image(self):
+    def convert_frame(self, frame):
+        """
+        Конвертирует кадр OpenCV из BGR в цветовое пространство стиля.
+
+        Args:
+            frame (numpy.ndarray): Кадр в формате BGR.
+
+        Returns:
+            numpy.ndarray: Кадр в формате RGB.
+        """
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def resize_image(self, image):
+        """
+        Приводит изображение к размеру, с которым работает стиль.
+
+        Args:
+            image (numpy.ndarray): Изображение после convert_frame.
+
+        Returns:
+            numpy.ndarray: Изображение размером screen_res.
+        """
+        return cv2.resize(image, self.screen_res, interpolation=cv2.INTER_AREA)
+
+    def set_frame(self, frame):
+        """
+        Подменяет обрабатываемое изображение новым кадром (например, из видеопотока).
+
+        Args:
+            frame (numpy.ndarray): Кадр в формате BGR.
+        """
+        self.cv2_image = frame
+        self.image = self.resize_image(self.convert_frame(frame))
+        self.converted_surface = None
+
+    def map_image(self):
         """
-        Абстрактный метод для отрисовки преобразованного изображения.
+        Абстрактный метод: сопоставляет пиксели изображения символам (и цветам).
 
         Raises:
             NotImplementedError: Если метод не реализован в подклассе.
         """
         raise NotImplementedError("This method should be implemented in the subclass.")
 
+    def draw_mapped(self, mapped):
+        """
+        Абстрактный метод: выводит символы по результату map_image.
+
+        Args:
+            mapped: Результат map_image.
+
+        Raises:
+            NotImplementedError: Если метод не реализован в подклассе.
+        """
+        raise NotImplementedError("This method should be implemented in the subclass.")
+
+    def draw_converted_image(self):
+        """
+        Отрисовывает преобразованное изображение: сопоставление (map_image), затем вывод символов.
+        """
+        self.draw_mapped(self.map_image())
+
+    def blit_chars(self, xs, ys, char_indices, rendered_char):
+        """
+        Выводит символы на поверхность одним вызовом blits.
+
+        Символы перекрываются (шаг сетки меньше высоты шрифта), поэтому порядок вывода
+        такой же, как при обходе по столбцам: сначала x, затем y. Пробелы (индекс 0) пропускаются.
+        Вывод выполняется в текущем потоке: pygame не отпускает GIL на время blits,
+        поэтому полосы в пуле потоков выполнялись бы по очереди.
+
+        Args:
+            xs (numpy.ndarray): Координаты X столбцов сетки.
+            ys (numpy.ndarray): Координаты Y строк сетки.
+            char_indices (numpy.ndarray): Индексы символов формы (len(ys), len(xs)).
+            rendered_char (callable): Функция (индекс символа, (строка, столбец)) -> pygame.Surface.
+        """
+        columns, rows = np.nonzero(char_indices.T)
+        xs, ys = xs.tolist(), ys.tolist()
+        self.surface.blits([(rendered_char(char_index, (row, column)), (xs[column], ys[row]))
+                            for column, row, char_index in zip(columns.tolist(), rows.tolist(),
+                                                              char_indices.T[columns, rows].tolist())], False)
+
     def draw_cv2_image(self):
         """
         Отображает исходное изображение с помощью OpenCV.
@@ -67,7 +155,7 @@ class ArtASCII:
         Отрисовывает преобразованное изображение и исходное изображение.
         """
         self.surface.fill('black')
-        self.draw_converted_image()
+        self.surface.blit(self.render_converted_image(), (0, 0))
         self.draw_cv2_image()
 
     def run(self):
@@ -98,13 +186,15 @@ class ArtASCIIGray(ArtASCII):
         path (str): Путь к изображению (по умолчанию 'photo/nya.jpg').
         font_size (int): Размер шрифта (по умолчанию 10).
         screen_res (tuple): Разрешение экрана (по умолчанию (800, 600)).
+        workers (int, optional): Количество потоков преобразования (None — bands.DEFAULT_WORKERS, 1 — без потоков).
     """
-    def __init__(self, path='photo/nya.jpg', font_size=10, screen_res=(800, 600)):
-        super().__init__(path, font_size, screen_res)
-        self.ASCII_CHARS = ' .",:;!~+-xmo*#W&8@'
-        self.ASCII_COEFF = 255 // (len(self.ASCII_CHARS) - 1)
-        self.image = self.get_image()
-        self.image = cv2.resize(self.image, self.screen_res, interpolation=cv2.INTER_AREA)
+    ASCII_CHARS = GRAY_ASCII_CHARS
+    ASCII_COEFF = GRAY_ASCII_COEFF
+
+    def __init__(self, path='photo/nya.jpg', font_size=10, screen_res=(800, 600), workers=None):
+        super().__init__(path, font_size, screen_res, workers)
+        if self.path is not None:
+            self.load_images()
         self.RENDERED_ASCII_CHARS = [self.font.render(char, False, 'white') for char in self.ASCII_CHARS]
 
     def get_image(self):
@@ -114,20 +204,46 @@ class ArtASCIIGray(ArtASCII):
         Returns:
             numpy.ndarray: Изображение в оттенках серого.
         """
-        self.cv2_image = cv2.imread(self.path)
-        gray_image = cv2.cvtColor(self.cv2_image, cv2.COLOR_BGR2GRAY)
-        return gray_image
+        self.cv2_image = load_image(self.path, self.screen_res)
+        return self.convert_frame(self.cv2_image)
 
-    def draw_converted_image(self):
+    def convert_frame(self, frame):
+        """
+        Конвертирует кадр OpenCV в оттенки серого.
+
+        Args:
+            frame (numpy.ndarray): Кадр в формате BGR.
+
+        Returns:
+            numpy.ndarray: Кадр в оттенках серого.
+        """
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    def map_image(self):
+        """
+        Находит индексы символов по яркости в узлах сетки символов.
+
+        Returns:
+            numpy.ndarray: Индексы символов формы (строки сетки, столбцы сетки).
+        """
+        samples = self.image[::self.CHAR_STEP, ::self.CHAR_STEP]
+        char_indices = np.empty(samples.shape, dtype=np.intp)
+
+        def convert_band(start, stop):
+            char_indices[start:stop] = samples[start:stop] // self.ASCII_COEFF
+        run_bands(convert_band, samples.shape[0], self.WORKERS)
+        return char_indices
+
+    def draw_mapped(self, char_indices):
         """
         Отрисовывает изображение в сером ASCII-стиле.
+
+        Args:
+            char_indices (numpy.ndarray): Результат map_image.
         """
-        char_indices = self.image // self.ASCII_COEFF
-        for x in range(0, self.WIDTH, self.CHAR_STEP):
-            for y in range(0, self.HEIGHT, self.CHAR_STEP):
-                char_index = char_indices[y, x]
-                if char_index:
-                    self.surface.blit(self.RENDERED_ASCII_CHARS[char_index], (x, y))
+        xs = np.arange(0, self.WIDTH, self.CHAR_STEP)
+        ys = np.arange(0, self.HEIGHT, self.CHAR_STEP)
+        self.blit_chars(xs, ys, char_indices, lambda char_index, _: self.RENDERED_ASCII_CHARS[char_index])
 
 class ArtASCIIColor(ArtASCII):
     """
@@ -140,15 +256,30 @@ class ArtASCIIColor(ArtASCII):
         font_size (int): Размер шрифта (по умолчанию 10).
         screen_res (tuple): Разрешение экрана (по умолчанию (800, 600)).
         color_lvl (int): Уровень квантования цвета (по умолчанию 8).
+        palette_method (str): Способ построения палитры: 'uniform' (равномерная сетка color_lvl³),
+            'median-cut' или 'kmeans' (адаптивная палитра по изображению) (по умолчанию 'uniform').
+        palette_size (int): Размер адаптивной палитры (по умолчанию 16).
+        dither (bool): Упорядоченный дизеринг для адаптивной палитры (по умолчанию False).
+        workers (int, optional): Количество потоков преобразования (None — bands.DEFAULT_WORKERS, 1 — без потоков).
+
+    Raises:
+        ValueError: Если указан неизвестный способ построения палитры.
     """
-    def __init__(self, path='photo/nya.jpg', font_size=10, screen_res=(800, 600), color_lvl=8):
-        super().__init__(path, font_size, screen_res)
+    ASCII_CHARS = COLOR_ASCII_CHARS
+    ASCII_COEFF = COLOR_ASCII_COEFF
+
+    def __init__(self, path='photo/nya.jpg', font_size=10, screen_res=(800, 600), color_lvl=8,
+                 palette_method='uniform', palette_size=16, dither=False, workers=None):
+        if palette_method not in PALETTE_METHODS:
+            raise ValueError(f"Unknown palette method: {palette_method}.")
+        super().__init__(path, font_size, screen_res, workers)
         self.COLOR_LVL = color_lvl
-        self.ASCII_CHARS = ' ixzao*#MW&8%B@$'
-        self.ASCII_COEFF = 255 // (len(self.ASCII_CHARS) - 1)
-        self.image = self.get_image()
-        self.image = cv2.resize(self.image, (self.WIDTH // self.CHAR_STEP, self.HEIGHT // self.CHAR_STEP), interpolation=cv2.INTER_AREA)
-        self.PALETTE, self.COLOR_COEFF = self.create_palette()
+        self.PALETTE_OPTIONS = (palette_method, palette_size, dither)
+        self.adaptive_palette = None
+        if self.path is not None:
+            self.load_images()
+        if palette_method == 'uniform':
+            self.PALETTE, self.COLOR_COEFF = self.create_palette()
 
     def get_image(self):
         """
@@ -157,8 +288,20 @@ class ArtASCIIColor(ArtASCII):
         Returns:
             numpy.ndarray: Изображение в формате RGB.
         """
-        self.cv2_image = cv2.imread(self.path)
-        return cv2.cvtColor(self.cv2_image, cv2.COLOR_BGR2RGB)
+        self.cv2_image = load_image(self.path, self.screen_res)
+        return self.convert_frame(self.cv2_image)
+
+    def resize_image(self, image):
+        """
+        Сжимает изображение до сетки символов (один пиксель на символ).
+
+        Args:
+            image (numpy.ndarray): Изображение в формате RGB.
+
+        Returns:
+            numpy.ndarray: Изображение размером сетки символов.
+        """
+        return cv2.resize(image, (self.WIDTH // self.CHAR_STEP, self.HEIGHT // self.CHAR_STEP), interpolation=cv2.INTER_AREA)
 
     def create_palette(self):
         """
@@ -184,19 +327,65 @@ class ArtASCIIColor(ArtASCII):
             palette[char] = char_palette
         return palette, color_coeff
 
-    def draw_converted_image(self):
+    def fit_palette(self):
+        """
+        Строит адаптивную палитру по текущему изображению и рендерит символы в её цветах.
+
+        Returns:
+            AdaptivePalette: Палитра с таблицей поиска.
+        """
+        palette_method, palette_size, _ = self.PALETTE_OPTIONS
+        self.adaptive_palette = AdaptivePalette(self.image, palette_size, palette_method)
+        self.PALETTE = {char: [self.font.render(char, False, tuple(int(c) for c in color))
+                               for color in self.adaptive_palette.colors]
+                        for char in self.ASCII_CHARS}
+        return self.adaptive_palette
+
+    def map_image(self):
+        """
+        Находит индексы символов и цветов в узлах сетки символов.
+
+        Адаптивная палитра строится при первом обращении.
+
+        Returns:
+            tuple: Индексы символов формы (строки сетки, столбцы сетки) и список строк цветов
+                (индексы палитры или ключи равномерной палитры).
+        """
+        adaptive = self.PALETTE_OPTIONS[0] != 'uniform'
+        if adaptive and self.adaptive_palette is None:
+            self.fit_palette()
+        grid_height, grid_width = self.image.shape[:2]
+        char_indices = np.empty((grid_height, grid_width), dtype=np.intp)
+        color_indices = np.empty((grid_height, grid_width) if adaptive else self.image.shape, dtype=np.intp)
+
+        def convert_band(start, stop):
+            band = self.image[start:stop]
+            char_indices[start:stop] = band.mean(axis=2) // self.ASCII_COEFF
+            if adaptive:
+                color_indices[start:stop] = self.adaptive_palette.map(band, self.PALETTE_OPTIONS[2])
+            else:
+                color_indices[start:stop] = band // self.COLOR_COEFF
+        # Границы полос кратны 4 строкам, чтобы не сдвигался узор дизеринга (матрица 4x4)
+        run_bands(convert_band, grid_height, self.WORKERS, align=4)
+        xs = np.arange(0, self.WIDTH, self.CHAR_STEP)
+        ys = np.arange(0, self.HEIGHT, self.CHAR_STEP)
+        img_xs = (xs / self.WIDTH * grid_width).astype(np.intp)
+        img_ys = (ys / self.HEIGHT * grid_height).astype(np.intp)
+        return char_indices[np.ix_(img_ys, img_xs)], color_indices[np.ix_(img_ys, img_xs)].tolist()
+
+    def draw_mapped(self, mapped):
         """
         Отрисовывает изображение в цветном ASCII-стиле.
+
+        Args:
+            mapped (tuple): Результат map_image.
         """
-        char_indices = self.image.mean(axis=2) // self.ASCII_COEFF
-        color_indices = self.image // self.COLOR_COEFF
-        for x in range(0, self.WIDTH, self.CHAR_STEP):
-            for y in range(0, self.HEIGHT, self.CHAR_STEP):
-                img_x = int(x / self.WIDTH * self.image.shape[1])
-                img_y = int(y / self.HEIGHT * self.image.shape[0])
-                char_index = int(char_indices[img_y, img_x])
-                if char_index:
-                    char = self.ASCII_CHARS[char_index]
-                    color = tuple(color_indices[img_y, img_x])
-                    rendered_char = self.PALETTE[char][color]
-                    self.surface.blit(rendered_char, (x, y))
\ No newline at end of file
+        char_indices, colors = mapped
+        adaptive = self.PALETTE_OPTIONS[0] != 'uniform'
+        xs = np.arange(0, self.WIDTH, self.CHAR_STEP)
+        ys = np.arange(0, self.HEIGHT, self.CHAR_STEP)
+
+        def rendered_char(char_index, position):
+            color = colors[position[0]][position[1]]
+            return self.PALETTE[self.ASCII_CHARS[char_index]][color if adaptive else tuple(color)]
+        self.blit_chars(xs, ys, char_indices, rendered_char)
\ No newline at end of file
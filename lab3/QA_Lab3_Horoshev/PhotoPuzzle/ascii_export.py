@@ -0,0 +1,171 @@
+import os
+import sys
+import argparse
+import numpy as np
+import cv2
+from loader import load_image
+from charsets import GRAY_ASCII_CHARS, GRAY_ASCII_COEFF, COLOR_ASCII_CHARS, COLOR_ASCII_COEFF
+
+FORMATS = ('text', 'ansi256', 'truecolor', 'html')
+ANSI_RESET = '\x1b[0m'
+ANSI256_PREFIXES = np.array([f"\x1b[38;5;{code}m" for code in range(256)])
+HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}
+# Символ в терминале примерно вдвое выше, чем шире
+CHAR_ASPECT = 0.5
+
+
+def ansi256_codes(colors):
+    """
+    Переводит цвета RGB в коды палитры ANSI 256 (куб 6x6x6).
+
+    Args:
+        colors (numpy.ndarray): Цвета формы (..., 3), uint8.
+
+    Returns:
+        numpy.ndarray: Коды 16..231.
+    """
+    levels = (colors.astype(np.uint16) * 5 + 127) // 255
+    return 16 + 36 * levels[..., 0] + 6 * levels[..., 1] + levels[..., 2]
+
+
+def color_prefixes(colors, fmt):
+    """
+    Строит для строки сетки префиксы смены цвета, только там, где цвет меняется.
+
+    Args:
+        colors (numpy.ndarray): Цвета строки формы (W, 3), uint8.
+        fmt (str): 'ansi256', 'truecolor' или 'html'.
+
+    Returns:
+        numpy.ndarray: Префиксы (пустая строка, если цвет не изменился).
+    """
+    if fmt == 'ansi256':
+        keys = ansi256_codes(colors)
+        prefixes = ANSI256_PREFIXES[keys]
+    else:
+        keys = (colors[:, 0].astype(np.uint32) << 16) | (colors[:, 1].astype(np.uint32) << 8) | colors[:, 2]
+        channels = [colors[:, i].astype(str) for i in range(3)]
+        if fmt == 'truecolor':
+            prefixes = np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(
+                '\x1b[38;2;', channels[0]), ';'), channels[1]), ';'), np.char.add(channels[2], 'm'))
+        else:
+            hex_colors = np.char.zfill(np.char.mod('%x', keys), 6)
+            prefixes = np.char.add(np.char.add('</span><span style="color:#', hex_colors), '">')
+    changed = np.ones(len(keys), dtype=bool)
+    changed[1:] = keys[1:] != keys[:-1]
+    return np.where(changed, prefixes, '')
+
+
+def format_lines(char_indices, chars, fmt='text', colors=None):
+    """
+    Превращает сетку индексов символов в строки выбранного формата.
+
+    Строки формируются по одной (генератор), поэтому их можно сразу писать в поток.
+    Для HTML открывающие и закрывающие теги присоединяются к первой и последней строке,
+    чтобы внутри <pre> не появлялись лишние пустые строки.
+
+    Args:
+        char_indices (numpy.ndarray): Индексы символов формы (H, W).
+        chars (str): Набор символов.
+        fmt (str): 'text', 'ansi256', 'truecolor' или 'html' (по умолчанию 'text').
+        colors (numpy.ndarray, optional): Цвета символов формы (H, W, 3) в формате RGB.
+
+    Yields:
+        str: Очередная строка (без перевода строки).
+
+    Raises:
+        ValueError: Если формат неизвестен.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}.")
+    char_table = np.array([HTML_ESCAPES.get(char, char) if fmt == 'html' else char for char in chars])
+    header, footer = ('<pre style="background:#000;color:#fff;line-height:1"><span>', '</span></pre>') \
+        if fmt == 'html' else ('', '')
+    rows = char_indices.shape[0]
+    if rows == 0:
+        if fmt == 'html':
+            yield header + footer
+        return
+    for row in range(rows):
+        row_chars = char_table[char_indices[row].astype(np.intp)]
+        if fmt == 'text' or colors is None:
+            line = ''.join(row_chars)
+        else:
+            line = ''.join(np.char.add(color_prefixes(colors[row], fmt), row_chars))
+            line += ANSI_RESET if fmt != 'html' else ''
+        yield (header if row == 0 else '') + line + (footer if row == rows - 1 else '')
+
+
+def image_to_grid(image, columns, char_aspect=CHAR_ASPECT):
+    """
+    Уменьшает изображение до сетки символов.
+
+    Args:
+        image (numpy.ndarray): Изображение в формате RGB.
+        columns (int): Количество столбцов.
+        char_aspect (float): Отношение ширины символа к высоте.
+
+    Returns:
+        numpy.ndarray: Сетка формы (строки, столбцы, 3).
+    """
+    height, width = image.shape[:2]
+    rows = max(1, round(height / width * columns * char_aspect))
+    return cv2.resize(image, (columns, rows), interpolation=cv2.INTER_AREA)
+
+
+def export_image(path, stream, style='color', fmt='text', columns=120):
+    """
+    Экспортирует изображение в ASCII без графического интерфейса.
+
+    Изображение читается с уменьшенным декодированием, сразу сжимается до сетки
+    символов, а строки пишутся в поток по одной.
+
+    Args:
+        path (str): Путь к изображению.
+        stream: Текстовый поток (sys.stdout или открытый файл).
+        style (str): 'gray' (набор ArtASCIIGray) или 'color' (набор ArtASCIIColor) (по умолчанию 'color').
+        fmt (str): Формат вывода (по умолчанию 'text').
+        columns (int): Ширина в символах (по умолчанию 120).
+    """
+    if style == 'gray':
+        chars, coeff = GRAY_ASCII_CHARS, GRAY_ASCII_COEFF
+    else:
+        chars, coeff = COLOR_ASCII_CHARS, COLOR_ASCII_COEFF
+    rows = max(1, round(columns * CHAR_ASPECT))
+    image = cv2.cvtColor(load_image(path, (columns, rows)), cv2.COLOR_BGR2RGB)
+    grid = image_to_grid(image, columns)
+    if style == 'gray':
+        gray = cv2.cvtColor(grid, cv2.COLOR_RGB2GRAY)
+        char_indices = gray // coeff
+        colors = np.repeat(gray[:, :, None], 3, axis=2)
+    else:
+        char_indices = grid.mean(axis=2) // coeff
+        colors = grid
+    for line in format_lines(char_indices, chars, fmt, colors):
+        stream.write(line)
+        stream.write('\n')
+
+
+if __name__ == '__main__':
+    """
+        Экспорт в ASCII из командной строки:
+        python ascii_export.py photo/fox.jpg --format ansi256 --columns 120 [--output fox.txt]
+    """
+    parser = argparse.ArgumentParser(description="PhotoPuzzle ASCII export")
+    parser.add_argument('path')
+    parser.add_argument('--style', choices=('gray', 'color'), default='color')
+    parser.add_argument('--format', choices=FORMATS, default='text')
+    parser.add_argument('--columns', type=int, default=120)
+    parser.add_argument('-o', '--output', help="файл для вывода (по умолчанию stdout)")
+    args = parser.parse_args()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            export_image(args.path, output_file, args.style, args.format, args.columns)
+    else:
+        try:
+            export_image(args.path, sys.stdout, args.style, args.format, args.columns)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Читатель закрыл канал (например, head): остаток вывода отбрасывается без трассировки
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
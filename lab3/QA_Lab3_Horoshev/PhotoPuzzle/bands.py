@@ -0,0 +1,86 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+_pools = {}
+
+
+def default_workers():
+    """
+    Возвращает количество потоков по умолчанию из переменной окружения PHOTOPUZZLE_WORKERS.
+
+    Если переменная не задана, не является целым числом или меньше 1, используется os.cpu_count().
+
+    Returns:
+        int: Количество потоков.
+    """
+    value = os.environ.get('PHOTOPUZZLE_WORKERS', '')
+    try:
+        workers = int(value)
+    except ValueError:
+        if value.strip():
+            print(f"Invalid PHOTOPUZZLE_WORKERS={value!r}, using the number of CPUs.")
+        workers = 0
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+# Количество потоков по умолчанию; можно задать переменной окружения PHOTOPUZZLE_WORKERS
+DEFAULT_WORKERS = default_workers()
+
+
+def thread_pool(workers):
+    """
+    Возвращает общий пул потоков заданного размера (создаётся при первом обращении).
+
+    Args:
+        workers (int): Количество потоков.
+
+    Returns:
+        ThreadPoolExecutor: Пул потоков.
+    """
+    if workers not in _pools:
+        _pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='photopuzzle-band')
+    return _pools[workers]
+
+
+def band_ranges(height, bands, align=1):
+    """
+    Делит строки изображения на горизонтальные полосы.
+
+    Начало каждой полосы кратно align, поэтому клетки (пиксели стиля, символы) не
+    разрезаются границей полосы.
+
+    Args:
+        height (int): Количество строк.
+        bands (int): Желаемое количество полос.
+        align (int): Кратность границ полос (по умолчанию 1).
+
+    Returns:
+        list: Пары (первая строка, строка после последней).
+    """
+    band_height = -(-height // max(1, bands))
+    band_height = max(align, -(-band_height // align) * align)
+    return [(start, min(start + band_height, height)) for start in range(0, height, band_height)]
+
+
+def run_bands(func, height, workers=None, align=1):
+    """
+    Выполняет func для каждой полосы строк в пуле потоков.
+
+    Операции NumPy и OpenCV отпускают GIL, поэтому полосы обрабатываются параллельно.
+    При одном потоке или одной полосе func вызывается в текущем потоке.
+
+    Args:
+        func (callable): Функция (первая строка, строка после последней).
+        height (int): Количество строк.
+        workers (int, optional): Количество потоков (None — DEFAULT_WORKERS).
+        align (int): Кратность границ полос (по умолчанию 1).
+
+    Returns:
+        list: Результаты func в порядке полос.
+    """
+    workers = workers or DEFAULT_WORKERS
+    ranges = band_ranges(height, workers, align)
+    if workers == 1 or len(ranges) <= 1:
+        return [func(start, stop) for start, stop in ranges]
+    futures = [thread_pool(workers).submit(func, start, stop) for start, stop in ranges]
+    return [future.result() for future in futures]
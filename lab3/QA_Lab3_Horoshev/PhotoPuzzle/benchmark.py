@@ -0,0 +1,258 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import sys
+import json
+import time
+import glob
+import inspect
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import statistics
+import numpy as np
+import pygame as pg
+import cv2
+from loader import load_image
+from quantize import PALETTE_METHODS
+from styles import style_names, style_info, load_style
+from bands import DEFAULT_WORKERS
+
+SCREEN_RESOLUTIONS = [(800, 600), (1920, 1080), (3840, 2160)]
+SYNTHETIC_SIZES = [(1280, 720), (1920, 1080), (3840, 2160)]
+SIZES = {'font_size': [10, 14], 'pixel_size': [5, 10]}
+COLOR_LEVELS = [4, 8]
+
+
+def make_synthetic_image(size, directory):
+    """
+    Создаёт синтетическое изображение (градиент с шумом) и сохраняет его в JPEG.
+
+    Args:
+        size (tuple): Размер изображения (ширина, высота).
+        directory (str): Папка для файла.
+
+    Returns:
+        str: Путь к созданному файлу.
+    """
+    width, height = size
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    image = np.dstack([np.broadcast_to(x, (height, width)),
+                       np.broadcast_to(y, (height, width)),
+                       (x + y) / 2]).astype(np.float32)
+    image += rng.normal(0, 12, image.shape).astype(np.float32)
+    path = os.path.join(directory, f"synthetic_{width}x{height}.jpg")
+    cv2.imwrite(path, np.clip(image, 0, 255).astype(np.uint8))
+    return path
+
+
+def measure(func, repeats):
+    """
+    Замеряет время и пик памяти (tracemalloc) выполнения функции.
+
+    Args:
+        func (callable): Функция без аргументов.
+        repeats (int): Количество повторов.
+
+    Returns:
+        tuple: Словарь со статистикой и результат последнего вызова.
+    """
+    times = []
+    peak = 0
+    result = None
+    for _ in range(repeats):
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - start_memory)
+    return {'min_s': min(times), 'median_s': statistics.median(times), 'peak_bytes': peak}, result
+
+
+def benchmark_case(style, image_path, screen_res, size, color_lvl, repeats, palette_method='uniform', workers=None):
+    """
+    Замеряет стадии преобразования для одного набора параметров.
+
+    Стадии: decode (чтение файла), resize (перевод цвета и масштабирование),
+    palette (построение палитры, таблицы поиска и цветных символов, только для цветных стилей),
+    quantize (попиксельное сопоставление цветам и символам, map_image) и render (отрисовка
+    готового сопоставления, draw_mapped). Для стилей без map_image quantize входит в render.
+
+    Args:
+        style (str): Название зарегистрированного стиля.
+        image_path (str): Путь к изображению.
+        screen_res (tuple): Разрешение экрана.
+        size (int): pixel_size или font_size.
+        color_lvl (int or None): Уровень квантования цвета.
+        repeats (int): Количество повторов.
+        palette_method (str): Способ построения палитры для цветных стилей (по умолчанию 'uniform').
+        workers (int, optional): Количество потоков преобразования (None — bands.DEFAULT_WORKERS).
+            Передаётся, только если конструктор стиля принимает workers.
+
+    Returns:
+        dict: Параметры и результаты по стадиям.
+    """
+    art_class, size_name = load_style(style), style_info(style)['size_param']
+    kwargs = {size_name: size, 'screen_res': screen_res}
+    # Стили из точек входа могут не принимать workers
+    accepts_workers = 'workers' in inspect.signature(art_class).parameters
+    if accepts_workers:
+        kwargs['workers'] = workers
+    if color_lvl is not None:
+        kwargs['color_lvl'] = color_lvl
+        kwargs['palette_method'] = palette_method
+    art = art_class(None, **kwargs)
+    art.cache = None
+    stages = {}
+    stages['decode'], frame = measure(lambda: load_image(image_path, screen_res, use_cache=False), repeats)
+    stages['resize'], _ = measure(lambda: art.set_frame(frame), repeats)
+    if color_lvl is not None:
+        stages['palette'], _ = measure(art.create_palette if palette_method == 'uniform' else art.fit_palette, repeats)
+    if hasattr(art, 'map_image'):
+        stages['quantize'], mapped = measure(art.map_image, repeats)
+
+        def render():
+            art.surface.fill('black')
+            art.draw_mapped(mapped)
+    else:
+        def render():
+            art.surface.fill('black')
+            art.draw_converted_image()
+    stages['render'], _ = measure(render, repeats)
+    return {
+        'style': style,
+        'image': os.path.basename(image_path),
+        'source_size': list(frame.shape[1::-1]),
+        'screen_res': list(screen_res),
+        size_name: size,
+        'color_lvl': color_lvl,
+        'palette_method': palette_method if color_lvl is not None else None,
+        'workers': (getattr(art, 'WORKERS', None) or DEFAULT_WORKERS) if accepts_workers else None,
+        'stages': stages,
+        'total_median_s': sum(stage['median_s'] for stage in stages.values()),
+    }
+
+
+def case_key(case):
+    """
+    Возвращает ключ для сопоставления одинаковых случаев в разных прогонах.
+
+    Args:
+        case (dict): Результат benchmark_case.
+
+    Returns:
+        tuple: Ключ случая.
+    """
+    return (case['style'], case['image'], tuple(case['screen_res']),
+            case.get('font_size'), case.get('pixel_size'), case['color_lvl'], case.get('palette_method'))
+
+
+def compare(results, baseline_path, threshold):
+    """
+    Сравнивает результаты с предыдущим прогоном и выводит регрессии.
+
+    Args:
+        results (dict): Текущие результаты.
+        baseline_path (str): Путь к JSON предыдущего прогона.
+        threshold (float): Допустимое замедление (например, 1.2 — на 20%).
+
+    Returns:
+        int: Количество найденных регрессий.
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as baseline_file:
+        baseline = {case_key(case): case for case in json.load(baseline_file)['cases']}
+    regressions = 0
+    for case in results['cases']:
+        old_case = baseline.get(case_key(case))
+        if old_case is None:
+            continue
+        for stage, stats in case['stages'].items():
+            old_stats = old_case['stages'].get(stage)
+            if old_stats and old_stats['median_s'] > 0:
+                ratio = stats['median_s'] / old_stats['median_s']
+                if ratio > threshold:
+                    regressions += 1
+                    print(f"REGRESSION {case_key(case)} {stage}: x{ratio:.2f}")
+    return regressions
+
+
+def main(argv=None):
+    """
+    Запускает набор бенчмарков и сохраняет результаты в JSON.
+
+    Args:
+        argv (list, optional): Аргументы командной строки.
+
+    Returns:
+        int: Код возврата (1, если при сравнении найдены регрессии).
+    """
+    parser = argparse.ArgumentParser(description="PhotoPuzzle conversion benchmarks")
+    parser.add_argument('--styles', nargs='+', default=style_names(), choices=style_names())
+    parser.add_argument('--photos', default='photo', help="папка с образцами изображений")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--palette-method', default='uniform', choices=list(PALETTE_METHODS))
+    parser.add_argument('--workers', type=int, help="потоков преобразования (по умолчанию все ядра)")
+    parser.add_argument('--quick', action='store_true', help="только 800x600 и первый образец")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--label', default='', help="метка прогона (версия, ветка)")
+    parser.add_argument('--compare', help="JSON предыдущего прогона для поиска регрессий")
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    pg.init()
+    tracemalloc.start()
+    images = sorted(glob.glob(os.path.join(args.photos, '*.jpg')) + glob.glob(os.path.join(args.photos, '*.png')))
+    screen_resolutions = SCREEN_RESOLUTIONS
+    synthetic_sizes = SYNTHETIC_SIZES
+    if args.quick:
+        images, screen_resolutions, synthetic_sizes = images[:1], SCREEN_RESOLUTIONS[:1], SYNTHETIC_SIZES[:1]
+    results = {
+        'label': args.label,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'pygame': pg.version.ver,
+        },
+        'repeats': args.repeats,
+        'cases': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        images += [make_synthetic_image(size, tmp_dir) for size in synthetic_sizes]
+        for style in args.styles:
+            size_name, has_color = style_info(style)['size_param'], style_info(style)['color']
+            for image_path in images:
+                for screen_res in screen_resolutions:
+                    for size in SIZES[size_name]:
+                        for color_lvl in (COLOR_LEVELS if has_color else [None]):
+                            case = benchmark_case(style, image_path, screen_res, size, color_lvl, args.repeats,
+                                                  args.palette_method, args.workers)
+                            results['cases'].append(case)
+                            print(f"{style:12} {case['image']:28} {screen_res[0]}x{screen_res[1]:<5} "
+                                  f"{size_name}={size:<3} color_lvl={color_lvl} "
+                                  + ' '.join(f"{name}={stats['median_s'] * 1000:.1f}ms"
+                                             for name, stats in case['stages'].items()))
+    if sys.platform != 'win32':
+        import resource
+        results['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Results saved to {args.output}")
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    """
+        Headless-бенчмарк стилей PhotoPuzzle:
+        python benchmark.py [--quick] [--output results.json] [--compare old.json]
+    """
+    sys.exit(main())
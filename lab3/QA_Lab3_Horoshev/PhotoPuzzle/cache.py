@@ -0,0 +1,323 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import atexit
+import threading
+import numpy as np
+
+CACHE_DIR_NAME = '.cache'
+# Кэш лежит рядом с модулями приложения и не зависит от текущей папки
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(APP_DIR, CACHE_DIR_NAME)
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+# Меняется при изменении формата записей; входит в каждый ключ
+CACHE_FORMAT_VERSION = 2
+# Как часто (в секундах) индекс сохраняется на диск только ради времени последнего доступа
+INDEX_FLUSH_INTERVAL = 30
+
+
+class ConvertedCache:
+    """
+    Дисковый кэш преобразованных изображений и промежуточных массивов.
+
+    Массивы хранятся в файлах .npy и загружаются через mmap. Ключ строится по хэшу
+    содержимого исходного файла и параметрам стиля, поэтому переименование файла
+    не сбрасывает кэш, а изменение содержимого — сбрасывает. Размер кэша ограничен,
+    при превышении удаляются давно не использованные записи (LRU).
+
+    CRC32 записи считается при сохранении и проверяется при первой загрузке записи за сеанс;
+    дальше проверяются только размер файла и заголовок .npy, чтобы не читать файл каждый раз
+    и сохранить выгоду от mmap. Метод verify проверяет все записи сразу. Время последнего доступа
+    обновляется в памяти, а индекс сохраняется не чаще раза в INDEX_FLUSH_INTERVAL секунд
+    и при завершении программы (flush).
+
+    Args:
+        cache_dir (str): Папка кэша (по умолчанию .cache рядом с модулями приложения).
+        max_bytes (int): Максимальный размер кэша в байтах (по умолчанию 512 МБ).
+
+    Attributes:
+        index (dict): Индекс кэша: записи ('entries') и хэши исходных файлов ('hashes').
+        verified (set): Записи, CRC32 которых проверен (или которые записаны) в этом сеансе.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        self.index = self.load_index()
+        self.verified = set()
+        self.dirty = False
+        self.last_flush = time.monotonic()
+
+    def load_index(self):
+        """
+        Загружает индекс кэша с диска.
+
+        Returns:
+            dict: Индекс кэша (пустой, если файла нет или он повреждён).
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                index = json.load(index_file)
+            if isinstance(index.get('entries'), dict) and isinstance(index.get('hashes'), dict):
+                return index
+        except (OSError, ValueError):
+            pass
+        return {'entries': {}, 'hashes': {}}
+
+    def save_index(self):
+        """
+        Атомарно сохраняет индекс кэша на диск.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as index_file:
+            json.dump(self.index, index_file)
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
+        self.last_flush = time.monotonic()
+
+    def flush(self):
+        """
+        Сохраняет индекс, если в нём есть несохранённые изменения (например, время доступа).
+        """
+        with self.lock:
+            if self.dirty:
+                self.save_index()
+
+    def file_hash(self, path):
+        """
+        Вычисляет SHA-1 содержимого файла.
+
+        Хэш запоминается по размеру и времени изменения файла, поэтому файл читается только один раз.
+
+        Args:
+            path (str): Путь к файлу.
+
+        Returns:
+            str: Шестнадцатеричный хэш.
+        """
+        stat = os.stat(path)
+        abs_path = os.path.abspath(path)
+        known = self.index['hashes'].get(abs_path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                sha1.update(chunk)
+        digest = sha1.hexdigest()
+        self.index['hashes'][abs_path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def make_key(self, path, **params):
+        """
+        Строит ключ кэша по содержимому файла, параметрам стиля и версии формата кэша.
+
+        Args:
+            path (str): Путь к исходному изображению.
+            **params: Параметры стиля (style, pixel_size, font_size, color_lvl, screen_res, render_version).
+
+        Returns:
+            str: Ключ кэша.
+        """
+        with self.lock:
+            digest = self.file_hash(path)
+        params_repr = repr(sorted(params.items()))
+        return hashlib.sha1(f"{CACHE_FORMAT_VERSION}|{digest}|{params_repr}".encode()).hexdigest()
+
+    def entry_path(self, key, name):
+        """
+        Возвращает путь к файлу записи.
+
+        Args:
+            key (str): Ключ кэша.
+            name (str): Имя массива ('image', 'preview', 'converted').
+
+        Returns:
+            str: Путь к файлу .npy.
+        """
+        return os.path.join(self.cache_dir, f"{key}_{name}.npy")
+
+    def remove(self, file_name):
+        """
+        Удаляет запись с диска и из индекса.
+
+        Если файл занят (например, на Windows он ещё открыт через mmap), запись остаётся
+        в индексе и будет удалена позже.
+
+        Args:
+            file_name (str): Имя файла записи.
+
+        Returns:
+            bool: True, если запись удалена.
+        """
+        try:
+            os.remove(os.path.join(self.cache_dir, file_name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not remove cache entry {file_name}: {e}")
+            return False
+        self.index['entries'].pop(file_name, None)
+        self.verified.discard(file_name)
+        return True
+
+    def check_crc(self, file_name, entry):
+        """
+        Сверяет CRC32 файла записи с сохранённым в индексе.
+
+        Args:
+            file_name (str): Имя файла записи.
+            entry (dict): Запись индекса.
+
+        Returns:
+            bool: True, если файл читается и CRC32 совпадает.
+        """
+        crc32 = 0
+        try:
+            with open(os.path.join(self.cache_dir, file_name), 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    crc32 = zlib.crc32(chunk, crc32)
+        except OSError:
+            return False
+        if crc32 != entry['crc32']:
+            return False
+        self.verified.add(file_name)
+        return True
+
+    def load(self, key, name):
+        """
+        Загружает массив из кэша через mmap.
+
+        При первой загрузке записи за сеанс проверяется CRC32, затем только размер файла
+        и заголовок .npy.
+
+        Args:
+            key (str): Ключ кэша.
+            name (str): Имя массива.
+
+        Returns:
+            numpy.ndarray or None: Массив (только для чтения, через mmap) или None при промахе.
+        """
+        path = self.entry_path(key, name)
+        file_name = os.path.basename(path)
+        with self.lock:
+            entry = self.index['entries'].get(file_name)
+            if entry is None:
+                return None
+            try:
+                valid = os.path.getsize(path) == entry['size'] and \
+                    (file_name in self.verified or self.check_crc(file_name, entry))
+                array = np.load(path, mmap_mode='r') if valid else None
+            except (OSError, ValueError):
+                array = None
+            if array is None:
+                if self.remove(file_name):
+                    print(f"Cache entry {file_name} is corrupted and was removed.")
+                    self.save_index()
+                return None
+            entry['last_access'] = time.time()
+            self.dirty = True
+            if time.monotonic() - self.last_flush >= INDEX_FLUSH_INTERVAL:
+                self.save_index()
+        return array
+
+    def verify(self):
+        """
+        Проверяет CRC32 всех записей и удаляет повреждённые.
+
+        Returns:
+            int: Количество удалённых записей.
+        """
+        removed = 0
+        with self.lock:
+            for file_name, entry in list(self.index['entries'].items()):
+                if not self.check_crc(file_name, entry) and self.remove(file_name):
+                    print(f"Cache entry {file_name} is corrupted and was removed.")
+                    removed += 1
+            if removed:
+                self.save_index()
+        return removed
+
+    def save(self, key, name, array):
+        """
+        Сохраняет массив в кэш и при необходимости вытесняет старые записи.
+
+        Args:
+            key (str): Ключ кэша.
+            name (str): Имя массива.
+            array (numpy.ndarray): Сохраняемый массив.
+        """
+        path = self.entry_path(key, name)
+        file_name = os.path.basename(path)
+        with self.lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = path + '.tmp.npy'
+            np.save(tmp_path, np.ascontiguousarray(array))
+            with open(tmp_path, 'rb') as file:
+                data = file.read()
+            os.replace(tmp_path, path)
+            self.index['entries'][file_name] = {'size': len(data), 'crc32': zlib.crc32(data),
+                                                'last_access': time.time()}
+            self.verified.add(file_name)
+            self.evict()
+            self.save_index()
+
+    def evict(self):
+        """
+        Удаляет наименее недавно использованные записи, пока кэш не уложится в max_bytes.
+
+        Занятые файлы пропускаются.
+        """
+        entries = self.index['entries']
+        total = sum(entry['size'] for entry in entries.values())
+        for file_name in sorted(entries, key=lambda name: entries[name]['last_access']):
+            if total <= self.max_bytes:
+                break
+            size = entries[file_name]['size']
+            if self.remove(file_name):
+                total -= size
+
+    def get_or_create(self, key, name, factory):
+        """
+        Возвращает массив из кэша или создаёт его и сохраняет.
+
+        Если запись не удаётся сохранить (папка только для чтения, файл занят), массив
+        возвращается без сохранения.
+
+        Args:
+            key (str): Ключ кэша.
+            name (str): Имя массива.
+            factory (callable): Функция без аргументов, создающая массив при промахе.
+
+        Returns:
+            numpy.ndarray: Массив из кэша или созданный factory.
+        """
+        array = self.load(key, name)
+        if array is None:
+            array = factory()
+            try:
+                self.save(key, name, array)
+            except OSError as e:
+                print(f"Could not save cache entry {name}: {e}")
+        return array
+
+
+_default_cache = None
+
+
+def default_cache():
+    """
+    Возвращает общий кэш приложения (создаётся при первом обращении).
+
+    Returns:
+        ConvertedCache: Кэш в папке CACHE_DIR.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ConvertedCache()
+        atexit.register(_default_cache.flush)
+    return _default_cache
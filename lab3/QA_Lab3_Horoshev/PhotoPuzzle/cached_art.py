@@ -0,0 +1,72 @@
+import pygame as pg
+import cv2
+from loader import load_image
+
+
+class CachedArtMixin:
+    """
+    Общая для стилей работа с кэшем преобразований (cache.py).
+
+    Класс стиля задаёт SIZE_PARAM и SIZE_ATTR и предоставляет path, screen_res, cache,
+    surface, get_image, resize_image и draw_converted_image.
+
+    Attributes:
+        RENDER_VERSION (int): Версия отрисовки; увеличивается при изменении результата,
+            чтобы не брать устаревшие записи кэша.
+        SIZE_PARAM (str): Имя параметра размера в ключе кэша ('font_size' или 'pixel_size').
+        SIZE_ATTR (str): Атрибут объекта стиля, в котором хранится этот размер.
+    """
+    RENDER_VERSION = 1
+    SIZE_PARAM = None
+    SIZE_ATTR = None
+
+    def cache_params(self):
+        """
+        Возвращает параметры, от которых зависит результат преобразования.
+
+        Returns:
+            dict: Параметры стиля для ключа кэша.
+        """
+        return {'style': type(self).__name__, self.SIZE_PARAM: getattr(self, self.SIZE_ATTR),
+                'color_lvl': getattr(self, 'COLOR_LVL', None), 'palette': getattr(self, 'PALETTE_OPTIONS', None),
+                'screen_res': tuple(self.screen_res), 'render_version': self.RENDER_VERSION}
+
+    def load_images(self):
+        """
+        Загружает изображение для обработки и превью для окна OpenCV.
+
+        Если кэш включён, массивы берутся из кэша, и повторное открытие не требует декодирования.
+        """
+        if self.cache is None:
+            self.image = self.resize_image(self.get_image())
+            return
+        size = {self.SIZE_PARAM: getattr(self, self.SIZE_ATTR)}
+        key = self.cache.make_key(self.path, style=type(self).__name__, screen_res=tuple(self.screen_res),
+                                  render_version=self.RENDER_VERSION, **size)
+        preview_key = self.cache.make_key(self.path, screen_res=tuple(self.screen_res))
+        # Изображение строится из декодированного исходника так же, как без кэша
+        self.image = self.cache.get_or_create(key, 'image', lambda: self.resize_image(self.get_image()))
+        self.cv2_image = self.cache.get_or_create(preview_key, 'preview', lambda: cv2.resize(
+            load_image(self.path, self.screen_res), self.screen_res, interpolation=cv2.INTER_AREA))
+
+    def render_converted_image(self):
+        """
+        Возвращает поверхность с преобразованным изображением.
+
+        Результат запоминается и сохраняется в кэш, поэтому преобразование выполняется один раз.
+
+        Returns:
+            pygame.Surface: Преобразованное изображение.
+        """
+        if self.converted_surface is None:
+            def convert():
+                self.surface.fill('black')
+                self.draw_converted_image()
+                return pg.surfarray.array3d(self.surface)
+            if self.cache is None or self.path is None:
+                pixels = convert()
+            else:
+                key = self.cache.make_key(self.path, **self.cache_params())
+                pixels = self.cache.get_or_create(key, 'converted', convert)
+            self.converted_surface = pg.surfarray.make_surface(pixels)
+        return self.converted_surface
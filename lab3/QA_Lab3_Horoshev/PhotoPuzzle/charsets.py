@@ -0,0 +1,6 @@
+# Наборы символов ASCII-стилей (от тёмного к светлому). Модуль не зависит от pygame,
+# поэтому наборы можно использовать без графического интерфейса (ascii_export.py).
+GRAY_ASCII_CHARS = ' .",:;!~+-xmo*#W&8@'
+GRAY_ASCII_COEFF = 255 // (len(GRAY_ASCII_CHARS) - 1)
+COLOR_ASCII_CHARS = ' ixzao*#MW&8%B@$'
+COLOR_ASCII_COEFF = 255 // (len(COLOR_ASCII_CHARS) - 1)
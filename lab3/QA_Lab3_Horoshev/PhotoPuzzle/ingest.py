@@ -0,0 +1,94 @@
+import os
+import struct
+import shutil
+import cv2
+from loader import read_image_size, load_image, CACHE_DIR_NAME
+from thumbnails import thumbnail_index
+
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+# Тот же предел, что у OpenCV по умолчанию (CV_IO_MAX_IMAGE_PIXELS)
+MAX_IMAGE_PIXELS = 1 << 30
+WORKING_RES = (1600, 1200)
+ORIGINALS_DIR_NAME = '.originals'
+
+
+def validate_image(path):
+    """
+    Проверяет файл до копирования: размер, формат и разрешение по заголовку (без декодирования).
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        tuple: Размер изображения (ширина, высота) с учётом поворота EXIF.
+
+    Raises:
+        ValueError: Если файл слишком большой, не является PNG/JPEG или имеет недопустимое разрешение.
+    """
+    file_size = os.path.getsize(path)
+    if file_size > MAX_UPLOAD_BYTES:
+        raise ValueError(f"File is too large: {file_size} bytes (limit {MAX_UPLOAD_BYTES}).")
+    try:
+        image_size = read_image_size(path)
+    except (struct.error, OSError) as e:
+        raise ValueError(f"Could not read image header: {e}.") from e
+    if image_size is None:
+        raise ValueError("File is not a PNG or JPEG image.")
+    width, height = image_size
+    if width <= 0 or height <= 0 or width * height > MAX_IMAGE_PIXELS:
+        raise ValueError(f"Unsupported image resolution: {width}x{height}.")
+    return image_size
+
+
+def ingest_image(src_path, dest_dir="photo", downscale=True, working_res=WORKING_RES):
+    """
+    Загружает изображение в папку приложения.
+
+    Файл проверяется по заголовку и копируется потоково (shutil.copyfile, на Linux — sendfile).
+    Если изображение больше working_res и включено уменьшение, оригинал сохраняется в
+    dest_dir/.originals, а в dest_dir кладётся уменьшенная рабочая копия, с которой и работают
+    стили. Размер рабочей копии считается по декодированному изображению, так как cv2.imread
+    поворачивает его по тегу EXIF Orientation. Миниатюра строится сразу при загрузке.
+
+    Args:
+        src_path (str): Путь к исходному файлу.
+        dest_dir (str): Папка с изображениями (по умолчанию "photo").
+        downscale (bool): Сохранять уменьшенную рабочую копию (по умолчанию True).
+        working_res (tuple): Максимальное разрешение рабочей копии (по умолчанию (1600, 1200)).
+
+    Returns:
+        str: Путь к изображению в dest_dir.
+
+    Raises:
+        ValueError: Если файл не прошёл проверку или не декодируется.
+    """
+    width, height = validate_image(src_path)
+    file_name = os.path.basename(src_path)
+    dest_path = os.path.join(dest_dir, file_name)
+    tmp_dir = os.path.join(dest_dir, CACHE_DIR_NAME)
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, 'upload_' + file_name)
+    scale = min(working_res[0] / width, working_res[1] / height)
+    if downscale and scale < 1:
+        originals_dir = os.path.join(dest_dir, ORIGINALS_DIR_NAME)
+        os.makedirs(originals_dir, exist_ok=True)
+        original_path = os.path.join(originals_dir, file_name)
+        shutil.copyfile(src_path, original_path)
+        try:
+            image = load_image(original_path, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               use_cache=False)
+        except FileNotFoundError as e:
+            os.remove(original_path)
+            raise ValueError(f"Could not decode {file_name}.") from e
+        decoded_height, decoded_width = image.shape[:2]
+        scale = min(working_res[0] / decoded_width, working_res[1] / decoded_height)
+        if scale < 1:
+            target_res = (max(1, int(decoded_width * scale)), max(1, int(decoded_height * scale)))
+            image = cv2.resize(image, target_res, interpolation=cv2.INTER_AREA)
+        if not cv2.imwrite(tmp_path, image):
+            raise ValueError(f"Could not write working copy of {file_name}.")
+    else:
+        shutil.copyfile(src_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+    thumbnail_index(dest_dir).add(dest_path)
+    return dest_path
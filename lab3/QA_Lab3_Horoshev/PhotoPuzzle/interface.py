@@ -1,6 +1,9 @@
 import pygame as pg
 import os
 from tkinter import Tk, filedialog
+from widgets import Button, WidgetLayer
+from styles import style_names
+from app import app_context
 
 class Interface:
     """
@@ -11,22 +14,25 @@ class Interface:
         screen_res (tuple): Разрешение экрана (по умолчанию (800, 600)).
 
     Attributes:
-        surface (pygame.Surface): Поверхность для отрисовки интерфейса.
+        app (AppContext): Общий контекст приложения (окно, таймер, шрифты).
+        surface (pygame.Surface): Поверхность для отрисовки интерфейса. Обновляется в начале
+            каждого select_event: просмотрщик мог изменить размер или флаги окна.
         font (pygame.font.Font): Шрифт для текста.
         clock (pygame.time.Clock): Объект для управления FPS.
     """
     def __init__(self, path="photo", screen_res=(800, 600)):
-        pg.init()
+        self.app = app_context()
         self.PATH = path
         self.screen_res = screen_res
         self.RES = self.WIDTH, self.HEIGHT = screen_res
-        self.surface = pg.display.set_mode(self.RES)
+        self.surface = self.app.display(self.RES)
         self.WHITE = (255, 255, 255)
         self.BLACK = (0, 0, 0)
         self.GRAY = (200, 200, 200)
         self.scroll_offset = 0
-        self.font = pg.font.Font(None, 36)
-        self.clock = pg.time.Clock()
+        self.font = self.app.font(36)
+        self.clock = self.app.clock
+        self.menus = {}
 
     def render_text(self, text, x, y, font=None, color=(0, 0, 0), center=True):
         """
@@ -48,6 +54,29 @@ class Interface:
             y -= text_surface.get_height() // 2
         self.surface.blit(text_surface, (x, y))
 
+    def choose_button(self, names):
+        """
+        Показывает вертикальное меню из кнопок и ждёт выбора.
+
+        Кнопки рендерятся один раз, экран перерисовывается только по событиям.
+
+        Args:
+            names (list): Надписи кнопок.
+
+        Returns:
+            str or None: Надпись выбранной кнопки или None, если окно закрыто.
+        """
+        key = tuple(names)
+        if key not in self.menus:
+            layer = WidgetLayer(self.surface, self.WHITE)
+            for i, name in enumerate(names):
+                layer.add(Button(name, (50, 50 + i * 50, 700, 50), self.font, self.GRAY, border_color=self.BLACK))
+            self.menus[key] = layer
+        # Окно могло быть пересоздано просмотрщиком, слой рисует в текущую поверхность
+        self.menus[key].surface = self.surface
+        widget = self.menus[key].wait_click()
+        return widget.text if widget is not None else None
+
     def run(self):
         """
         Запускает основной цикл интерфейса.
@@ -73,7 +102,7 @@ class StartMenu(Interface):
     """
     Класс для отображения стартового меню.
 
-    Наследуется от Interface и предоставляет выбор между началом, загрузкой изображения и выходом.
+    Наследуется от Interface и предоставляет выбор между началом, пазлом, видео, загрузкой изображения и выходом.
     """
     def __init__(self, path="photo", screen_res=(800, 600)):
         super().__init__(path, screen_res)
@@ -83,93 +112,222 @@ class StartMenu(Interface):
         Обрабатывает выбор пользователя в стартовом меню.
 
         Returns:
-            str: Выбранный пункт меню ('Start', 'Upload Image', 'Exit').
+            str: Выбранный пункт меню ('Start', 'Puzzle', 'Video', 'Upload Image', 'Exit').
         """
+        self.surface = self.app.display(self.RES)
         pg.display.set_caption("Start Menu")
-        start_button = ['Start', 'Upload Image', 'Exit']
-        running = True
-        select_button = None
-        while running:
-            self.surface.fill(self.WHITE)
-            for i, name_button in enumerate(start_button):
-                rect = pg.Rect(50, 50 + i * 50, 700, 50)
-                pg.draw.rect(self.surface, self.GRAY, rect)
-                pg.draw.rect(self.surface, self.BLACK, rect, 2)
-                self.render_text(name_button, rect.centerx, rect.centery)
-            for event in pg.event.get():
-                if event.type == pg.QUIT:
-                    exit()
-                if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_x, mouse_y = event.pos
-                    for i, name_button in enumerate(start_button):
-                        rect = pg.Rect(50, 50 + i * 50, 700, 50)
-                        if rect.collidepoint(mouse_x, mouse_y):
-                            select_button = name_button
-                            running = False
-            pg.display.flip()
-            self.clock.tick(30)
+        start_button = ['Start', 'Puzzle', 'Video', 'Upload Image', 'Exit']
+        select_button = self.choose_button(start_button)
+        if select_button is None:
+            exit()
         return select_button
 
 class PickPicture(Interface):
     """
     Класс для выбора изображения из папки.
 
-    Наследуется от Interface и отображает список изображений с прокруткой.
+    Наследуется от Interface и отображает список изображений с миниатюрами и прокруткой.
+    Отрисовываются только видимые строки, надписи рендерятся один раз, а список
+    и миниатюры берутся из ThumbnailIndex, который обновляется в фоне.
     """
+    ROW_HEIGHT = 60
+    ROW_TOP = 50
+
     def __init__(self, path="photo", screen_res=(800, 600)):
         super().__init__(path, screen_res)
+        self.text_surfaces = {}
+        self.thumb_surfaces = {}
+
+    def get_text_surface(self, text):
+        """
+        Возвращает отрендеренную надпись, используя кэш.
+
+        Args:
+            text (str): Текст надписи.
+
+        Returns:
+            pygame.Surface: Поверхность с текстом.
+        """
+        if text not in self.text_surfaces:
+            self.text_surfaces[text] = self.font.render(text, True, self.BLACK)
+        return self.text_surfaces[text]
+
+    def get_thumb_surface(self, index, img_path):
+        """
+        Возвращает поверхность миниатюры, если она уже построена.
+
+        Поверхность запоминается вместе с массивом миниатюры, из которого она построена:
+        если индекс заменил миниатюру (файл загружен заново), поверхность строится снова.
+
+        Args:
+            index (ThumbnailIndex): Индекс миниатюр.
+            img_path (str): Путь к изображению.
+
+        Returns:
+            pygame.Surface or None: Миниатюра или None, если она ещё не готова.
+        """
+        thumbnail = index.thumbnails.get(img_path)
+        if thumbnail is None:
+            return None
+        if self.thumb_outdated(index, img_path):
+            self.thumb_surfaces[img_path] = (thumbnail, pg.image.frombuffer(
+                thumbnail.tobytes(), (thumbnail.shape[1], thumbnail.shape[0]), 'RGB'))
+        return self.thumb_surfaces[img_path][1]
+
+    def thumb_outdated(self, index, img_path):
+        """
+        Проверяет, появилась ли в индексе миниатюра, отличная от уже показанной.
+
+        Args:
+            index (ThumbnailIndex): Индекс миниатюр.
+            img_path (str): Путь к изображению.
+
+        Returns:
+            bool: True, если миниатюра готова, а поверхность для неё ещё не построена.
+        """
+        thumbnail = index.thumbnails.get(img_path)
+        cached = self.thumb_surfaces.get(img_path)
+        return thumbnail is not None and (cached is None or cached[0] is not thumbnail)
+
+    def prune_thumb_surfaces(self, index, images):
+        """
+        Удаляет поверхности миниатюр удалённых файлов и заменённых миниатюр.
+
+        Args:
+            index (ThumbnailIndex): Индекс миниатюр.
+            images (list): Текущий список изображений.
+        """
+        current = set(images)
+        for img_path in list(self.thumb_surfaces):
+            if img_path not in current or index.thumbnails.get(img_path) is not self.thumb_surfaces[img_path][0]:
+                del self.thumb_surfaces[img_path]
+
+    def visible_rows(self, count):
+        """
+        Вычисляет диапазон строк, попадающих на экран.
+
+        Args:
+            count (int): Количество изображений.
+
+        Returns:
+            range: Индексы видимых строк.
+        """
+        first = max(0, int((self.scroll_offset - self.ROW_TOP) // self.ROW_HEIGHT))
+        last = min(count, int((self.scroll_offset + self.HEIGHT - self.ROW_TOP) // self.ROW_HEIGHT) + 1)
+        return range(first, last)
+
+    def row_at(self, mouse_x, mouse_y, count):
+        """
+        Определяет строку под курсором без перебора всех изображений.
+
+        Args:
+            mouse_x (int): Координата X курсора.
+            mouse_y (int): Координата Y курсора.
+            count (int): Количество изображений.
+
+        Returns:
+            int or None: Индекс строки или None, если курсор не над строкой.
+        """
+        if not 50 <= mouse_x < 750:
+            return None
+        row, offset = divmod(mouse_y + self.scroll_offset - self.ROW_TOP, self.ROW_HEIGHT)
+        if 0 <= row < count and offset < 50:
+            return int(row)
+        return None
+
+    def draw_row(self, index, images, i):
+        """
+        Отрисовывает одну строку списка.
+
+        Args:
+            index (ThumbnailIndex): Индекс миниатюр.
+            images (list): Пути к изображениям.
+            i (int): Номер строки.
+
+        Returns:
+            pygame.Rect: Область экрана, занятая строкой.
+        """
+        y = self.ROW_TOP + i * self.ROW_HEIGHT - self.scroll_offset
+        rect = pg.Rect(50, y, 700, 50)
+        pg.draw.rect(self.surface, self.GRAY, rect)
+        pg.draw.rect(self.surface, self.BLACK, rect, 2)
+        thumb_surface = self.get_thumb_surface(index, images[i])
+        if thumb_surface is not None:
+            self.surface.blit(thumb_surface, thumb_surface.get_rect(center=(rect.x + 30, rect.centery)))
+        text_surface = self.get_text_surface(os.path.basename(images[i]))
+        self.surface.blit(text_surface, text_surface.get_rect(center=rect.center))
+        return rect
+
+    def slider_rect(self, total_height):
+        """
+        Вычисляет положение слайдера прокрутки.
+
+        Args:
+            total_height (int): Полная высота списка.
+
+        Returns:
+            pygame.Rect: Область слайдера.
+        """
+        slider_width = 20
+        slider_height = max(30, min(1, self.HEIGHT / total_height) * self.HEIGHT)
+        slider_y = (self.scroll_offset / total_height) * self.HEIGHT
+        return pg.Rect(self.WIDTH - slider_width - 10, slider_y, slider_width, slider_height)
 
     def select_event(self):
         """
         Обрабатывает выбор изображения пользователем.
 
+        Экран перерисовывается только при прокрутке, изменении списка или появлении
+        миниатюр; в остальное время цикл ждёт события и не нагружает процессор.
+
         Returns:
             str or None: Путь к выбранному изображению или None, если выбор отменён.
         """
+        self.surface = self.app.display(self.RES)
         pg.display.set_caption("Выбор картинки")
+        # Миниатюры (cv2, numpy) загружаются только при открытии экрана выбора
+        from thumbnails import thumbnail_index
+        index = thumbnail_index(self.PATH)
         try:
-            images = [os.path.join(self.PATH, img) for img in os.listdir(self.PATH)
-                      if img.lower().endswith(('.png', '.jpg', '.jpeg'))]
+            index.refresh()
         except FileNotFoundError:
             print(f"Папка {self.PATH} не найдена!")
             return None
+        images = index.images
+        self.prune_thumb_surfaces(index, images)
         if not images:
             print(f"В папке {self.PATH} нет подходящих изображений!")
             return
-        total_height = len(images) * 60
-        visible_ratio = min(1, self.HEIGHT / total_height)
-        slider_height = max(30, visible_ratio * self.HEIGHT)
-        slider_width = 20
-        slider_x = self.WIDTH - slider_width - 10
         dragging_slider = False
         start_drag_y = None
         running = True
         selected_image = None
+        redraw = True
+        last_refresh = pg.time.get_ticks()
         while running:
-            self.surface.fill(self.WHITE)
-            for i, img_path in enumerate(images):
-                y = 50 + i * 60 - self.scroll_offset
-                if -50 < y < self.HEIGHT:
-                    rect = pg.Rect(50, y, 700, 50)
-                    pg.draw.rect(self.surface, self.GRAY, rect)
-                    pg.draw.rect(self.surface, self.BLACK, rect, 2)
-                    self.render_text(os.path.basename(img_path), rect.centerx, rect.centery)
-            # Отрисовка слайдера для прокрутки списка изображений
-            slider_y = (self.scroll_offset / total_height) * self.HEIGHT
-            slider_rect = pg.Rect(slider_x, slider_y, slider_width, slider_height)
-            pg.draw.rect(self.surface, self.GRAY, slider_rect)
-            for event in pg.event.get():
+            total_height = max(1, len(images) * self.ROW_HEIGHT)
+            max_offset = max(0, total_height - self.HEIGHT)
+            if redraw:
+                self.surface.fill(self.WHITE)
+                for i in self.visible_rows(len(images)):
+                    self.draw_row(index, images, i)
+                pg.draw.rect(self.surface, self.GRAY, self.slider_rect(total_height))
+                pg.display.flip()
+                redraw = False
+            event = pg.event.wait(250)
+            events = [event] + pg.event.get() if event.type != pg.NOEVENT else []
+            for event in events:
                 if event.type == pg.QUIT:
                     running = False
+                elif event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED, pg.WINDOWRESTORED):
+                    redraw = True
                 if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_x, mouse_y = event.pos
-                    for i, img_path in enumerate(images):
-                        rect = pg.Rect(50, 50 + i * 50, 700, 50)
-                        if rect.collidepoint(mouse_x, mouse_y):
-                            selected_image = img_path
-                            running = False
+                    row = self.row_at(event.pos[0], event.pos[1], len(images))
+                    if row is not None:
+                        selected_image = images[row]
+                        running = False
                 if event.type == pg.MOUSEBUTTONDOWN:
-                    if slider_rect.collidepoint(event.pos):
+                    if self.slider_rect(total_height).collidepoint(event.pos):
                         dragging_slider = True
                         start_drag_y = event.pos[1]
                 elif event.type == pg.MOUSEBUTTONUP:
@@ -178,20 +336,35 @@ class PickPicture(Interface):
                     if dragging_slider:
                         delta_y = event.pos[1] - start_drag_y
                         self.scroll_offset += (delta_y / self.HEIGHT) * total_height
-                        self.scroll_offset = max(0, min(self.scroll_offset, total_height - self.HEIGHT))
+                        self.scroll_offset = max(0, min(self.scroll_offset, max_offset))
                         start_drag_y = event.pos[1]
+                        redraw = True
                 elif event.type == pg.MOUSEWHEEL:
                     self.scroll_offset -= event.y * 30
-                    self.scroll_offset = max(0, min(self.scroll_offset, total_height - self.HEIGHT))
-            pg.display.flip()
-            self.clock.tick(30)
+                    self.scroll_offset = max(0, min(self.scroll_offset, max_offset))
+                    redraw = True
+            if pg.time.get_ticks() - last_refresh > 1000:
+                last_refresh = pg.time.get_ticks()
+                try:
+                    if index.refresh() and index.images:
+                        images = index.images
+                        self.prune_thumb_surfaces(index, images)
+                        redraw = True
+                except FileNotFoundError:
+                    pass
+            if not redraw:
+                # Дорисовываем только строки, для которых появились новые миниатюры
+                dirty_rects = [self.draw_row(index, images, i) for i in self.visible_rows(len(images))
+                               if self.thumb_outdated(index, images[i])]
+                if dirty_rects:
+                    pg.display.update(dirty_rects)
         return selected_image
 
 class PickArt(Interface):
     """
     Класс для выбора стиля обработки изображения.
 
-    Наследуется от Interface и предоставляет список доступных стилей.
+    Наследуется от Interface и предоставляет список стилей из реестра (styles.py).
     """
     def __init__(self, path="photo", screen_res=(800, 600)):
         super().__init__(path, screen_res)
@@ -201,32 +374,11 @@ class PickArt(Interface):
         Обрабатывает выбор стиля пользователем.
 
         Returns:
-            str or None: Выбранный стиль ('ASCII', 'ASCII Color', 'PIXEL', 'PIXEL Color') или None.
+            str or None: Название выбранного стиля или None.
         """
+        self.surface = self.app.display(self.RES)
         pg.display.set_caption("Выбор cтиля")
-        art_array = ['ASCII', 'ASCII Color', 'PIXEL', 'PIXEL Color']
-        running = True
-        select_art = None
-        while running:
-            self.surface.fill(self.WHITE)
-            for i, name_art in enumerate(art_array):
-                rect = pg.Rect(50, 50 + i * 50, 700, 50)
-                pg.draw.rect(self.surface, self.GRAY, rect)
-                pg.draw.rect(self.surface, self.BLACK, rect, 2)
-                self.render_text(name_art, rect.centerx, rect.centery)
-            for event in pg.event.get():
-                if event.type == pg.QUIT:
-                    running = False
-                if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_x, mouse_y = event.pos
-                    for i, name_art in enumerate(art_array):
-                        rect = pg.Rect(50, 50 + i * 50, 700, 50)
-                        if rect.collidepoint(mouse_x, mouse_y):
-                            select_art = name_art
-                            running = False
-            pg.display.flip()
-            self.clock.tick(30)
-        return select_art
+        return self.choose_button(style_names())
 
 class UploadImage(Interface):
     """
@@ -240,6 +392,9 @@ class UploadImage(Interface):
     def open_file_explorer_and_copy(self):
         """
         Открывает проводник для выбора изображения и копирует его в папку photo.
+
+        Файл проверяется и копируется через ingest_image: большие изображения сохраняются
+        как уменьшенная рабочая копия, оригинал — в photo/.originals.
         """
         Tk().withdraw()
         file_path = filedialog.askopenfilename(
@@ -247,15 +402,14 @@ class UploadImage(Interface):
             filetypes=[("Image Files", "*.png;*.jpg;*.jpeg")]
         )
         if file_path:
+            from ingest import ingest_image
             try:
                 if not os.path.exists(self.PATH):
                     os.makedirs(self.PATH)
-                file_name = os.path.basename(file_path)
-                dest_path = os.path.join(self.PATH, file_name)
-                with open(file_path, 'rb') as src_file:
-                    with open(dest_path, 'wb') as dest_file:
-                        dest_file.write(src_file.read())
-                print(f"Image {file_name} copied to {self.PATH}")
+                ingest_image(file_path, self.PATH)
+                print(f"Image {os.path.basename(file_path)} copied to {self.PATH}")
+            except ValueError as e:
+                print(f"Image rejected: {e}")
             except Exception as e:
                 print(f"Error copying file: {e}")
 
@@ -263,4 +417,29 @@ class UploadImage(Interface):
         """
         Запускает процесс выбора и копирования изображения.
         """
-        self.open_file_explorer_and_copy()
\ No newline at end of file
+        self.surface = self.app.display(self.RES)
+        self.open_file_explorer_and_copy()
+
+class PickVideo(Interface):
+    """
+    Класс для выбора источника видео через проводник.
+
+    Наследуется от Interface. Если файл не выбран, используется веб-камера.
+    """
+    def __init__(self, path="video", screen_res=(800, 600)):
+        super().__init__(path, screen_res)
+
+    def select_event(self):
+        """
+        Открывает проводник для выбора видеофайла.
+
+        Returns:
+            str or int: Путь к видеофайлу или 0 (веб-камера по умолчанию).
+        """
+        self.surface = self.app.display(self.RES)
+        Tk().withdraw()
+        file_path = filedialog.askopenfilename(
+            title="Select a Video (Cancel - webcam)",
+            filetypes=[("Video Files", "*.mp4;*.avi;*.mkv;*.mov")]
+        )
+        return file_path if file_path else 0
@@ -0,0 +1,192 @@
+import os
+import struct
+import cv2
+from cache import CACHE_DIR_NAME, default_cache
+
+REDUCED_FLAGS = {
+    cv2.IMREAD_COLOR: {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8},
+    cv2.IMREAD_GRAYSCALE: {2: cv2.IMREAD_REDUCED_GRAYSCALE_2, 4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+                           8: cv2.IMREAD_REDUCED_GRAYSCALE_8},
+}
+LARGE_IMAGE_PIXELS = 4096 * 4096
+
+
+def exif_orientation(segment):
+    """
+    Читает тег Orientation (0x0112) из сегмента APP1 с данными EXIF.
+
+    Args:
+        segment (bytes): Содержимое сегмента APP1 (без маркера и длины).
+
+    Returns:
+        int: Значение Orientation (1, если тег не найден или данные повреждены).
+    """
+    if not segment.startswith(b'Exif\x00\x00'):
+        return 1
+    tiff = segment[6:]
+    byte_order = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+    if byte_order is None:
+        return 1
+    try:
+        ifd_offset = struct.unpack(byte_order + 'I', tiff[4:8])[0]
+        entry_count = struct.unpack(byte_order + 'H', tiff[ifd_offset:ifd_offset + 2])[0]
+        for i in range(entry_count):
+            entry_offset = ifd_offset + 2 + 12 * i
+            tag, _, _, value = struct.unpack(byte_order + 'HHIH', tiff[entry_offset:entry_offset + 10])
+            if tag == 0x0112:
+                return value
+    except struct.error:
+        return 1
+    return 1
+
+
+def read_image_size(path):
+    """
+    Определяет размер изображения по заголовку файла, не декодируя его.
+
+    Поддерживаются PNG (чанк IHDR) и JPEG (маркеры SOF). Для JPEG учитывается
+    тег EXIF Orientation: cv2.imread с IMREAD_COLOR и IMREAD_GRAYSCALE поворачивает
+    такие изображения, поэтому при повороте на 90° ширина и высота меняются местами.
+
+    Args:
+        path (str): Путь к изображению.
+
+    Returns:
+        tuple or None: Размер (ширина, высота) после декодирования или None,
+            если формат не распознан или заголовок повреждён.
+    """
+    try:
+        return parse_image_header(path)
+    except struct.error:
+        return None
+
+
+def parse_image_header(path):
+    """
+    Разбирает заголовок PNG или JPEG (см. read_image_size).
+
+    Args:
+        path (str): Путь к изображению.
+
+    Returns:
+        tuple or None: Размер (ширина, высота) или None.
+
+    Raises:
+        struct.error: Если заголовок обрезан внутри поля.
+    """
+    orientation = 1
+    with open(path, 'rb') as file:
+        header = file.read(24)
+        if header.startswith(b'\x89PNG\r\n\x1a\n') and header[12:16] == b'IHDR':
+            return struct.unpack('>II', header[16:24])
+        if not header.startswith(b'\xff\xd8'):
+            return None
+        file.seek(2)
+        while True:
+            marker = file.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            while marker[1] == 0xFF:
+                marker = marker[1:] + file.read(1)
+            if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                continue
+            length_bytes = file.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack('>H', length_bytes)[0]
+            if length < 2:
+                return None
+            # SOF0..SOF15, кроме DHT (C4), JPG (C8) и DAC (CC)
+            if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                frame_header = file.read(5)
+                if len(frame_header) < 5:
+                    return None
+                height, width = struct.unpack('>xHH', frame_header)
+                # Orientation 5..8 — поворот на 90°
+                return (height, width) if orientation >= 5 else (width, height)
+            if marker[1] == 0xE1 and orientation == 1:
+                orientation = exif_orientation(file.read(length - 2))
+                continue
+            file.seek(length - 2, os.SEEK_CUR)
+
+
+def choose_reduction(image_size, target_res):
+    """
+    Выбирает максимальный коэффициент уменьшения при декодировании.
+
+    Коэффициент выбирается так, чтобы уменьшенное изображение оставалось не меньше целевого разрешения.
+
+    Args:
+        image_size (tuple): Размер исходного изображения (ширина, высота).
+        target_res (tuple): Целевое разрешение (ширина, высота).
+
+    Returns:
+        int: Коэффициент 1, 2, 4 или 8.
+    """
+    width, height = image_size
+    target_width, target_height = target_res
+    for factor in (8, 4, 2):
+        if width // factor >= target_width and height // factor >= target_height:
+            return factor
+    return 1
+
+
+def load_image(path, target_res, flags=cv2.IMREAD_COLOR, use_cache=True):
+    """
+    Загружает изображение с ограниченным расходом памяти.
+
+    Если изображение заметно больше целевого разрешения, используется уменьшенное
+    декодирование (IMREAD_REDUCED_*, для JPEG — масштабирование DCT, полный кадр в память не попадает).
+    Для больших исходников результат дополнительно сохраняется в общий кэш приложения
+    (ConvertedCache: ключ по содержимому файла, ограничение размера и вытеснение LRU)
+    и при повторной загрузке отображается в память (mmap) без декодирования. Если кэш
+    недоступен для записи, возвращается декодированное изображение.
+
+    Args:
+        path (str): Путь к изображению.
+        target_res (tuple): Разрешение, до которого изображение будет уменьшено (ширина, высота).
+        flags (int): Флаги cv2.imread (по умолчанию cv2.IMREAD_COLOR).
+        use_cache (bool): Использовать кэш для больших исходников (по умолчанию True).
+
+    Returns:
+        numpy.ndarray: Изображение не меньше target_res (если исходник больше).
+
+    Raises:
+        FileNotFoundError: Если изображение не найдено или не может быть декодировано.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Image at path {path} could not be loaded.")
+    image_size = read_image_size(path)
+    is_large = image_size is not None and image_size[0] * image_size[1] > LARGE_IMAGE_PIXELS
+    if is_large and use_cache:
+        cache = default_cache()
+        key = cache.make_key(path, target_res=tuple(target_res), flags=flags)
+        return cache.get_or_create(key, 'decoded', lambda: decode_image(path, image_size, target_res, flags))
+    return decode_image(path, image_size, target_res, flags)
+
+
+def decode_image(path, image_size, target_res, flags):
+    """
+    Декодирует изображение, по возможности с уменьшением (IMREAD_REDUCED_*).
+
+    Args:
+        path (str): Путь к изображению.
+        image_size (tuple or None): Размер по заголовку (ширина, высота) или None, если он неизвестен.
+        target_res (tuple): Целевое разрешение.
+        flags (int): Флаги cv2.imread.
+
+    Returns:
+        numpy.ndarray: Изображение.
+
+    Raises:
+        FileNotFoundError: Если изображение не может быть декодировано.
+    """
+    read_flags = flags
+    if image_size is not None and flags in REDUCED_FLAGS:
+        factor = choose_reduction(image_size, target_res)
+        if factor > 1:
+            read_flags = REDUCED_FLAGS[flags][factor]
+    image = cv2.imread(path, read_flags)
+    if image is None:
+        raise FileNotFoundError(f"Image at path {path} could not be loaded.")
+    return image
@@ -1,8 +1,31 @@
-from ascii import ArtASCIIGray, ArtASCIIColor
-from pixel import ArtPixelGray, ArtPixelColor
-from interface import StartMenu, PickPicture, PickArt, UploadImage
+from interface import StartMenu, PickPicture, PickArt, UploadImage, PickVideo
+from styles import load_style
 
 
+def select_art(picture, art):
+    """
+    Предлагает выбрать изображение и стиль и создаёт объект стиля.
+
+    Args:
+        picture (PickPicture): Экран выбора изображения.
+        art (PickArt): Экран выбора стиля.
+
+    Returns:
+        ArtASCII or ArtPixel or None: Объект стиля или None, если выбор отменён.
+    """
+    selected_path = picture.select_event()
+    selected_art = None
+
+    if selected_path:
+        print(f"Вы выбрали: {selected_path}")
+        selected_art = art.select_event()
+    else:
+        print("Выбор отменён или изображение не выбрано.")
+
+    if selected_art is not None:
+        return load_style(selected_art)(selected_path)
+    return None
+
 
 if __name__ == '__main__':
     """
@@ -10,42 +33,38 @@ if __name__ == '__main__':
 
         Запускает цикл интерфейса, позволяющий пользователю выбрать изображение,
         стиль обработки и запустить преобразование.
+        Экраны создаются один раз и используют общее окно из app_context().
+        Модули просмотра, головоломки и видео (а с ними cv2 и numpy) импортируются
+        только при выборе соответствующего пункта, чтобы меню открывалось быстрее.
     """
+    start = StartMenu()
+    picture = PickPicture("photo")
+    art = PickArt()
+    video = PickVideo()
+    download_image = UploadImage()
     while True:
-        start = StartMenu()
         selected_menu = start.select_event()
         match selected_menu:
             case 'Start':
-                picture = PickPicture("photo")
-                selected_path = picture.select_event()
-                selected_art = None
-
-                if selected_path:
-                    print(f"Вы выбрали: {selected_path}")
-                    art = PickArt()
-                    selected_art = art.select_event()
-                else:
-                    print("Выбор отменён или изображение не выбрано.")
-
-                match selected_art:
-                    case 'ASCII':
-                        app = ArtASCIIGray(selected_path)
-                        app.run()
-                    case 'ASCII Color':
-                        app = ArtASCIIColor(selected_path)
-                        app.run()
-                    case 'PIXEL':
-                        app = ArtPixelGray(selected_path)
-                        app.run()
-                    case 'PIXEL Color':
-                        app = ArtPixelColor(selected_path)
-                        app.run()
+                app = select_art(picture, art)
+                if app is not None:
+                    from viewer import ArtViewer
+                    ArtViewer(app).run()
+            case 'Puzzle':
+                app = select_art(picture, art)
+                if app is not None:
+                    from puzzle import PuzzleGame
+                    PuzzleGame(app).run()
+            case 'Video':
+                selected_source = video.select_event()
+                selected_art = art.select_event()
+                if selected_art is not None:
+                    from video import VideoArt
+                    try:
+                        VideoArt(load_style(selected_art), selected_source).run()
+                    except FileNotFoundError as e:
+                        print(e)
             case 'Upload Image':
-                download_image = UploadImage()
                 download_image.select_event()
             case 'Exit':
                 exit()
-
-
-
-
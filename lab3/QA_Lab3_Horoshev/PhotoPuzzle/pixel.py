@@ -1,34 +1,48 @@
 import pygame as pg
 import numpy as np
-import pygame.gfxdraw
 import cv2
+from loader import load_image
+from cache import default_cache
+from quantize import AdaptivePalette, PALETTE_METHODS
+from app import app_context
+from cached_art import CachedArtMixin
+from bands import run_bands
 
-class ArtPixel:
+class ArtPixel(CachedArtMixin):
     """
     Базовый класс для преобразования изображения в пиксельный стиль.
 
     Инициализирует Pygame, загружает изображение и предоставляет методы для его обработки и отображения.
 
     Args:
-        path (str): Путь к изображению (по умолчанию 'photo/nya.png').
+        path (str or None): Путь к изображению (по умолчанию 'photo/nya.png'). None — кадры передаются через set_frame.
         pixel_size (int): Размер пикселя для обработки (по умолчанию 5).
         screen_res (tuple): Разрешение экрана в формате (ширина, высота) (по умолчанию (800, 600)).
+        workers (int, optional): Количество потоков преобразования (None — bands.DEFAULT_WORKERS, 1 — без потоков).
 
     Attributes:
+        app (AppContext): Общий контекст приложения (окно, таймер, шрифты).
         surface (pygame.Surface): Поверхность для отрисовки изображения.
         clock (pygame.time.Clock): Объект для управления FPS.
         image (numpy.ndarray): Загруженное изображение в формате RGB.
+        cache (ConvertedCache or None): Кэш преобразований (None — кэш отключён).
     """
-    def __init__(self, path='photo/nya.png', pixel_size=5, screen_res=(800, 600)):
-        pg.init()
+    SIZE_PARAM = 'pixel_size'
+    SIZE_ATTR = 'PIXEL_SIZE'
+
+    def __init__(self, path='photo/nya.png', pixel_size=5, screen_res=(800, 600), workers=None):
+        self.app = app_context()
         self.path = path
         self.screen_res = screen_res
-        self.image = self.get_image()
         self.PIXEL_SIZE = pixel_size
-        self.image = cv2.resize(self.image, self.screen_res, interpolation=cv2.INTER_AREA)
+        self.WORKERS = workers
+        self.cache = default_cache()
+        self.converted_surface = None
+        if self.path is not None:
+            self.load_images()
         self.RES = self.WIDTH, self.HEIGHT = self.screen_res
-        self.surface = pg.display.set_mode(self.RES)
-        self.clock = pg.time.Clock()
+        self.surface = self.app.display(self.RES)
+        self.clock = self.app.clock
 
     def get_image(self):
         """
@@ -37,9 +51,43 @@ class ArtPixel:
         Returns:
             numpy.ndarray: Изображение в формате RGB.
         """
-        self.cv2_image = cv2.imread(self.path)
-        image = cv2.cvtColor(self.cv2_image, cv2.COLOR_BGR2RGB)
-        return image
+        self.cv2_image = load_image(self.path, self.screen_res)
+        return self.convert_frame(self.cv2_image)
+
+    def convert_frame(self, frame):
+        """
+        Конвертирует кадр OpenCV из BGR в RGB.
+
+        Args:
+            frame (numpy.ndarray): Кадр в формате BGR.
+
+        Returns:
+            numpy.ndarray: Кадр в формате RGB.
+        """
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def resize_image(self, image):
+        """
+        Приводит изображение к разрешению экрана.
+
+        Args:
+            image (numpy.ndarray): Изображение после convert_frame.
+
+        Returns:
+            numpy.ndarray: Изображение размером screen_res.
+        """
+        return cv2.resize(image, self.screen_res, interpolation=cv2.INTER_AREA)
+
+    def set_frame(self, frame):
+        """
+        Подменяет обрабатываемое изображение новым кадром (например, из видеопотока).
+
+        Args:
+            frame (numpy.ndarray): Кадр в формате BGR.
+        """
+        self.cv2_image = frame
+        self.image = self.resize_image(self.convert_frame(frame))
+        self.converted_surface = None
 
     def draw_cv2_image(self):
         """
@@ -48,15 +96,64 @@ class ArtPixel:
         resized_cv2_image = cv2.resize(self.cv2_image, self.screen_res, interpolation=cv2.INTER_AREA)
         cv2.imshow('photo', resized_cv2_image)
 
-    def draw_converted_image(self):
+    def cell_colors(self, cells):
         """
-        Абстрактный метод для отрисовки преобразованного изображения.
+        Абстрактный метод: возвращает цвета клеток стиля.
+
+        Args:
+            cells (numpy.ndarray): Образцы изображения (по одному пикселю на клетку) формы (h, w, 3).
 
         Raises:
             NotImplementedError: Если метод не реализован в подклассе.
         """
         raise NotImplementedError("Этот метод должен быть реализован в дочернем классе")
 
+    def map_image(self):
+        """
+        Находит цвета всех клеток PIXEL_SIZE x PIXEL_SIZE (попиксельное квантование).
+
+        Строки клеток делятся на горизонтальные полосы, которые обрабатываются пулом потоков
+        (NumPy и OpenCV отпускают GIL). Границы полос кратны 4 клеткам, поэтому узор
+        дизеринга (матрица 4x4) не сдвигается, и результат совпадает с однопоточным.
+
+        Returns:
+            numpy.ndarray: Цвета клеток формы (строки, столбцы, 3), uint8.
+        """
+        cells = self.image[::self.PIXEL_SIZE, ::self.PIXEL_SIZE]
+        colors = np.empty(cells.shape[:2] + (3,), dtype=np.uint8)
+
+        def convert_band(start, stop):
+            colors[start:stop] = self.cell_colors(np.ascontiguousarray(cells[start:stop]))
+        run_bands(convert_band, cells.shape[0], self.WORKERS, align=4)
+        return colors
+
+    def draw_mapped(self, colors):
+        """
+        Отрисовывает клетки найденных цветов.
+
+        Клетки разворачиваются в блоки и выводятся на поверхность за одну операцию.
+        Эта стадия выполняется в текущем потоке: при разбиении на полосы она не ускорялась.
+
+        Args:
+            colors (numpy.ndarray): Результат map_image.
+        """
+        blocks = np.repeat(np.repeat(colors, self.PIXEL_SIZE, axis=0), self.PIXEL_SIZE, axis=1)
+        pg.surfarray.blit_array(self.surface, blocks[:self.HEIGHT, :self.WIDTH].swapaxes(0, 1))
+
+    def draw_converted_image(self):
+        """
+        Отрисовывает изображение клетками PIXEL_SIZE x PIXEL_SIZE.
+        """
+        self.draw_mapped(self.map_image())
+
+    def draw(self):
+        """
+        Отрисовывает преобразованное изображение и исходное изображение.
+        """
+        self.surface.fill('black')
+        self.surface.blit(self.render_converted_image(), (0, 0))
+        self.draw_cv2_image()
+
     def run(self):
         """
         Запускает основной цикл обработки и отображения изображения.
@@ -70,7 +167,7 @@ class ArtPixel:
             for i in pg.event.get():
                 if i.type == pg.QUIT:
                     running = False
-            self.draw_converted_image()
+            self.draw()
             pg.display.set_caption("Обработанное изображение")
             pg.display.flip()
             self.clock.tick()
@@ -86,15 +183,32 @@ class ArtPixelColor(ArtPixel):
         pixel_size (int): Размер пикселя (по умолчанию 5).
         color_lvl (int): Уровень квантования цвета (по умолчанию 8).
         screen_res (tuple): Разрешение экрана (по умолчанию (800, 600)).
+        palette_method (str): Способ построения палитры: 'uniform' (равномерная сетка color_lvl³),
+            'median-cut' или 'kmeans' (адаптивная палитра по изображению) (по умолчанию 'uniform').
+        palette_size (int): Размер адаптивной палитры (по умолчанию 16).
+        dither (bool): Упорядоченный дизеринг для адаптивной палитры (по умолчанию False).
+        workers (int, optional): Количество потоков преобразования (None — bands.DEFAULT_WORKERS, 1 — без потоков).
 
     Attributes:
         PALETTE (dict): Словарь цветовой палитры для пикселей.
+        PALETTE_TABLE (numpy.ndarray): Та же палитра в виде массива (ключ цвета -> цвет) для векторного поиска.
         COLOR_COEFF (int): Коэффициент квантования цвета.
+        adaptive_palette (AdaptivePalette or None): Адаптивная палитра (строится по первому изображению или кадру).
+
+    Raises:
+        ValueError: Если указан неизвестный способ построения палитры.
     """
-    def __init__(self, path='photo/nya.png', pixel_size=5, color_lvl=8, screen_res=(800, 600)):
-        super().__init__(path, pixel_size, screen_res)
+    def __init__(self, path='photo/nya.png', pixel_size=5, color_lvl=8, screen_res=(800, 600),
+                 palette_method='uniform', palette_size=16, dither=False, workers=None):
+        if palette_method not in PALETTE_METHODS:
+            raise ValueError(f"Unknown palette method: {palette_method}.")
+        super().__init__(path, pixel_size, screen_res, workers)
         self.COLOR_LVL = color_lvl
-        self.PALETTE, self.COLOR_COEFF = self.create_palette()
+        self.PALETTE_OPTIONS = (palette_method, palette_size, dither)
+        self.adaptive_palette = None
+        if palette_method == 'uniform':
+            self.PALETTE, self.COLOR_COEFF = self.create_palette()
+            self.PALETTE_TABLE = self.create_palette_table()
 
     def create_palette(self):
         """
@@ -117,19 +231,55 @@ class ArtPixelColor(ArtPixel):
             palette[color_key] = color
         return palette, color_coeff
 
-    def draw_converted_image(self):
+    def fit_palette(self):
         """
-        Отрисовывает изображение в цветном пиксельном стиле.
+        Строит адаптивную палитру по текущему изображению.
+
+        Returns:
+            AdaptivePalette: Палитра с таблицей поиска.
         """
-        self.surface.fill('black')
-        color_indices = self.image // self.COLOR_COEFF
-        for x in range(0, self.WIDTH, self.PIXEL_SIZE):
-            for y in range(0, self.HEIGHT, self.PIXEL_SIZE):
-                color_key = tuple(color_indices[y, x])
-                if sum(color_key):
-                    color = self.PALETTE[color_key]
-                    pygame.gfxdraw.box(self.surface, (x, y, self.PIXEL_SIZE, self.PIXEL_SIZE), color)
-        self.draw_cv2_image()
+        palette_method, palette_size, _ = self.PALETTE_OPTIONS
+        self.adaptive_palette = AdaptivePalette(self.image, palette_size, palette_method)
+        return self.adaptive_palette
+
+    def create_palette_table(self):
+        """
+        Переводит палитру PALETTE в массив, индексируемый ключом цвета.
+
+        Returns:
+            numpy.ndarray: Массив формы (K, K, K, 3), uint8.
+        """
+        size = max(max(key) for key in self.PALETTE) + 1
+        table = np.zeros((size, size, size, 3), dtype=np.uint8)
+        for color_key, color in self.PALETTE.items():
+            table[color_key] = color
+        return table
+
+    def cell_colors(self, cells):
+        """
+        Находит цвета клеток по равномерной или адаптивной палитре.
+
+        Args:
+            cells (numpy.ndarray): Образцы изображения формы (h, w, 3).
+
+        Returns:
+            numpy.ndarray: Цвета клеток формы (h, w, 3), uint8.
+        """
+        if self.PALETTE_OPTIONS[0] != 'uniform':
+            return self.adaptive_palette.colors[self.adaptive_palette.map(cells, self.PALETTE_OPTIONS[2])]
+        color_keys = cells // self.COLOR_COEFF
+        return self.PALETTE_TABLE[color_keys[..., 0], color_keys[..., 1], color_keys[..., 2]]
+
+    def map_image(self):
+        """
+        Находит цвета клеток; адаптивная палитра строится при первом обращении.
+
+        Returns:
+            numpy.ndarray: Цвета клеток формы (строки, столбцы, 3), uint8.
+        """
+        if self.PALETTE_OPTIONS[0] != 'uniform' and self.adaptive_palette is None:
+            self.fit_palette()
+        return super().map_image()
 
 class ArtPixelGray(ArtPixel):
     """
@@ -141,29 +291,20 @@ class ArtPixelGray(ArtPixel):
         path (str): Путь к изображению (по умолчанию 'photo/nya.png').
         pixel_size (int): Размер пикселя (по умолчанию 5).
         screen_res (tuple): Разрешение экрана (по умолчанию (800, 600)).
+        workers (int, optional): Количество потоков преобразования (None — bands.DEFAULT_WORKERS, 1 — без потоков).
     """
-    def __init__(self, path='photo/nya.png', pixel_size=5, screen_res=(800, 600)):
-        super().__init__(path, pixel_size, screen_res)
+    def __init__(self, path='photo/nya.png', pixel_size=5, screen_res=(800, 600), workers=None):
+        super().__init__(path, pixel_size, screen_res, workers)
 
-    def apply_gray_filter(self):
+    def cell_colors(self, cells):
         """
-        Применяет серый фильтр к изображению.
+        Переводит клетки в оттенки серого.
 
-        Returns:
-            numpy.ndarray: Изображение в оттенках серого, преобразованное в RGB для отображения.
-        """
-        gray_image = cv2.cvtColor(self.image, cv2.COLOR_RGB2GRAY)
-        gray_image_rgb = cv2.merge([gray_image] * 3)
-        return gray_image_rgb
+        Args:
+            cells (numpy.ndarray): Образцы изображения формы (h, w, 3).
 
-    def draw_converted_image(self):
-        """
-        Отрисовывает изображение в сером пиксельном стиле.
+        Returns:
+            numpy.ndarray: Серые цвета клеток формы (h, w, 3), uint8.
         """
-        self.surface.fill('black')
-        gray_image = self.apply_gray_filter()
-        for x in range(0, self.WIDTH, self.PIXEL_SIZE):
-            for y in range(0, self.HEIGHT, self.PIXEL_SIZE):
-                r, g, b = gray_image[y, x]
-                pygame.gfxdraw.box(self.surface, (x, y, self.PIXEL_SIZE, self.PIXEL_SIZE), (r, g, b))
-        self.draw_cv2_image()
\ No newline at end of file
+        gray_cells = cv2.cvtColor(cells, cv2.COLOR_RGB2GRAY)
+        return cv2.merge([gray_cells] * 3)
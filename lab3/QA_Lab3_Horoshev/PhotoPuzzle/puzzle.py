@@ -0,0 +1,308 @@
+import random
+import pygame as pg
+
+
+class Piece:
+    """
+    Фрагмент пазла.
+
+    Args:
+        index (int): Номер фрагмента.
+        row (int): Строка фрагмента в собранном изображении.
+        col (int): Столбец фрагмента в собранном изображении.
+        surface (pygame.Surface): Изображение фрагмента (subsurface, без копирования пикселей).
+
+    Attributes:
+        x (float): Координата X на поле.
+        y (float): Координата Y на поле.
+        group (int): Номер группы; соединённые фрагменты двигаются вместе.
+    """
+    def __init__(self, index, row, col, surface):
+        self.index = index
+        self.row = row
+        self.col = col
+        self.surface = surface
+        self.x = 0.0
+        self.y = 0.0
+        self.group = index
+
+    def rect(self):
+        """
+        Возвращает прямоугольник фрагмента на поле.
+
+        Returns:
+            pygame.Rect: Прямоугольник фрагмента.
+        """
+        return pg.Rect(round(self.x), round(self.y), *self.surface.get_size())
+
+
+class PuzzleBoard:
+    """
+    Поле пазла: нарезка изображения, перемешивание, поиск фрагмента под курсором и стыковка.
+
+    Фрагменты — это subsurface исходной поверхности, поэтому нарезка не копирует пиксели.
+    Для поиска фрагмента под курсором используется равномерная сетка (ячейка равна размеру
+    фрагмента): каждая ячейка хранит фрагменты, которые её пересекают, поэтому проверяются
+    только несколько кандидатов, а не все фрагменты. Соседи для стыковки находятся по
+    строке и столбцу за O(1).
+
+    Args:
+        image (pygame.Surface): Преобразованное изображение.
+        rows (int): Количество строк (по умолчанию 8).
+        cols (int): Количество столбцов (по умолчанию 8).
+        board_size (tuple): Размер поля (по умолчанию (800, 600)).
+        snap_distance (int): Расстояние стыковки в пикселях (по умолчанию 12).
+
+    Attributes:
+        pieces (list): Фрагменты по номерам (row * cols + col).
+        order (list): Порядок отрисовки (последний — сверху).
+        depth (dict): Позиция фрагмента в порядке отрисовки (номер фрагмента -> глубина).
+        groups (dict): Группы соединённых фрагментов (номер группы -> список фрагментов).
+    """
+    def __init__(self, image, rows=8, cols=8, board_size=(800, 600), snap_distance=12):
+        self.image = image
+        self.rows = rows
+        self.cols = cols
+        self.board_size = board_size
+        self.snap_distance = snap_distance
+        self.piece_width = image.get_width() // cols
+        self.piece_height = image.get_height() // rows
+        self.pieces = [Piece(row * cols + col, row, col,
+                             image.subsurface((col * self.piece_width, row * self.piece_height,
+                                               self.piece_width, self.piece_height)))
+                       for row in range(rows) for col in range(cols)]
+        self.order = list(self.pieces)
+        self.depth = {piece.index: i for i, piece in enumerate(self.order)}
+        self.groups = {piece.group: [piece] for piece in self.pieces}
+        self.grid = {}
+        self.piece_cells = {}
+        for piece in self.pieces:
+            self.index_piece(piece)
+
+    def cells_of(self, piece):
+        """
+        Возвращает ячейки сетки, которые пересекает фрагмент.
+
+        Args:
+            piece (Piece): Фрагмент.
+
+        Returns:
+            list: Координаты ячеек.
+        """
+        rect = piece.rect()
+        return [(cell_x, cell_y)
+                for cell_x in range(rect.left // self.piece_width, (rect.right - 1) // self.piece_width + 1)
+                for cell_y in range(rect.top // self.piece_height, (rect.bottom - 1) // self.piece_height + 1)]
+
+    def index_piece(self, piece):
+        """
+        Обновляет положение фрагмента в сетке поиска.
+
+        Args:
+            piece (Piece): Фрагмент.
+        """
+        for cell in self.piece_cells.get(piece.index, ()):
+            self.grid[cell].discard(piece)
+        cells = self.cells_of(piece)
+        for cell in cells:
+            self.grid.setdefault(cell, set()).add(piece)
+        self.piece_cells[piece.index] = cells
+
+    def shuffle(self, seed=None):
+        """
+        Раскладывает фрагменты по полю в случайном порядке.
+
+        Args:
+            seed (int, optional): Зерно генератора случайных чисел.
+        """
+        rng = random.Random(seed)
+        max_x = max(0, self.board_size[0] - self.piece_width)
+        max_y = max(0, self.board_size[1] - self.piece_height)
+        self.groups = {}
+        for piece in self.pieces:
+            piece.group = piece.index
+            piece.x = rng.uniform(0, max_x)
+            piece.y = rng.uniform(0, max_y)
+            self.groups[piece.group] = [piece]
+            self.index_piece(piece)
+        # Перемешивается исходный порядок, чтобы одно и то же зерно давало одну раскладку
+        self.order = list(self.pieces)
+        rng.shuffle(self.order)
+        self.depth = {piece.index: i for i, piece in enumerate(self.order)}
+
+    def piece_at(self, pos):
+        """
+        Находит верхний фрагмент под точкой.
+
+        Args:
+            pos (tuple): Координаты точки.
+
+        Returns:
+            Piece or None: Фрагмент или None.
+        """
+        cell = (pos[0] // self.piece_width, pos[1] // self.piece_height)
+        candidates = [piece for piece in self.grid.get(cell, ()) if piece.rect().collidepoint(pos)]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda piece: self.depth[piece.index])
+
+    def bring_to_front(self, group):
+        """
+        Поднимает группу фрагментов наверх.
+
+        Args:
+            group (int): Номер группы.
+        """
+        members = set(self.groups[group])
+        self.order = [piece for piece in self.order if piece not in members] + self.groups[group]
+        self.depth = {piece.index: i for i, piece in enumerate(self.order)}
+
+    def move_group(self, group, dx, dy):
+        """
+        Сдвигает группу фрагментов.
+
+        Args:
+            group (int): Номер группы.
+            dx (float): Сдвиг по X.
+            dy (float): Сдвиг по Y.
+        """
+        for piece in self.groups[group]:
+            piece.x += dx
+            piece.y += dy
+            self.index_piece(piece)
+
+    def neighbours(self, piece):
+        """
+        Возвращает соседей фрагмента в собранном изображении.
+
+        Args:
+            piece (Piece): Фрагмент.
+
+        Returns:
+            list: Пары (сосед, (ожидаемый сдвиг X, ожидаемый сдвиг Y)).
+        """
+        result = []
+        for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            row, col = piece.row + d_row, piece.col + d_col
+            if 0 <= row < self.rows and 0 <= col < self.cols:
+                result.append((self.pieces[row * self.cols + col],
+                               (d_col * self.piece_width, d_row * self.piece_height)))
+        return result
+
+    def snap(self, group):
+        """
+        Стыкует группу с соседними фрагментами, если они лежат достаточно близко.
+
+        Args:
+            group (int): Номер группы.
+
+        Returns:
+            int: Номер группы после стыковки.
+        """
+        snapped = True
+        while snapped:
+            snapped = False
+            for piece in self.groups[group]:
+                for neighbour, (offset_x, offset_y) in self.neighbours(piece):
+                    if neighbour.group == group:
+                        continue
+                    dx = neighbour.x - offset_x - piece.x
+                    dy = neighbour.y - offset_y - piece.y
+                    if dx * dx + dy * dy <= self.snap_distance ** 2:
+                        self.move_group(group, dx, dy)
+                        group = self.merge(group, neighbour.group)
+                        snapped = True
+                        break
+                if snapped:
+                    break
+        return group
+
+    def merge(self, group, other):
+        """
+        Объединяет две группы (меньшая присоединяется к большей).
+
+        Args:
+            group (int): Номер первой группы.
+            other (int): Номер второй группы.
+
+        Returns:
+            int: Номер объединённой группы.
+        """
+        if len(self.groups[group]) < len(self.groups[other]):
+            group, other = other, group
+        for piece in self.groups[other]:
+            piece.group = group
+        self.groups[group] += self.groups.pop(other)
+        self.bring_to_front(group)
+        return group
+
+    def solved(self):
+        """
+        Проверяет, собран ли пазл.
+
+        Returns:
+            bool: True, если все фрагменты в одной группе.
+        """
+        return len(self.groups) == 1
+
+    def draw(self, surface):
+        """
+        Отрисовывает фрагменты в порядке наложения.
+
+        Args:
+            surface (pygame.Surface): Поверхность для отрисовки.
+        """
+        surface.blits([(piece.surface, (round(piece.x), round(piece.y))) for piece in self.order], False)
+
+
+class PuzzleGame:
+    """
+    Игровой цикл пазла на основе преобразованного изображения стиля.
+
+    Args:
+        art: Объект стиля (ArtASCII* или ArtPixel*) с загруженным изображением.
+        rows (int): Количество строк (по умолчанию 8).
+        cols (int): Количество столбцов (по умолчанию 8).
+        scale (float): Масштаб изображения относительно окна (по умолчанию 0.6).
+        fps (int): Частота кадров (по умолчанию 60).
+    """
+    def __init__(self, art, rows=8, cols=8, scale=0.6, fps=60):
+        self.art = art
+        self.surface = art.surface
+        self.fps = fps
+        self.clock = art.clock
+        image = art.render_converted_image()
+        size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        self.image = pg.transform.smoothscale(image, size)
+        self.board = PuzzleBoard(self.image, rows, cols, self.surface.get_size())
+        self.board.shuffle()
+        self.font = art.app.font(36)
+
+    def run(self):
+        """
+        Запускает игровой цикл: фрагменты перетаскиваются мышью и стыкуются с соседями.
+        """
+        dragging = None
+        running = True
+        while running:
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    running = False
+                elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+                    piece = self.board.piece_at(event.pos)
+                    if piece is not None:
+                        dragging = piece.group
+                        self.board.bring_to_front(dragging)
+                elif event.type == pg.MOUSEMOTION and dragging is not None:
+                    self.board.move_group(dragging, *event.rel)
+                elif event.type == pg.MOUSEBUTTONUP and event.button == 1 and dragging is not None:
+                    self.board.snap(dragging)
+                    dragging = None
+            self.surface.fill((40, 40, 40))
+            self.board.draw(self.surface)
+            if self.board.solved():
+                text_surface = self.font.render("Собрано!", True, (255, 255, 0))
+                self.surface.blit(text_surface, (10, 10))
+            pg.display.set_caption(f"Пазл — {len(self.board.groups)} групп, FPS {self.clock.get_fps():.0f}")
+            pg.display.flip()
+            self.clock.tick(self.fps)
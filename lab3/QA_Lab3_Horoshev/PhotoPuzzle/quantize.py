@@ -0,0 +1,191 @@
+import numpy as np
+
+PALETTE_METHODS = ('uniform', 'median-cut', 'kmeans')
+# Веса каналов R, G, B для «перцептивного» расстояния между цветами
+PERCEPTUAL_WEIGHTS = np.sqrt(np.array([2.0, 4.0, 3.0], dtype=np.float32))
+LUT_BITS = 5
+MAX_SAMPLE = 20000
+BAYER_4X4 = np.array([[0, 8, 2, 10],
+                      [12, 4, 14, 6],
+                      [3, 11, 1, 9],
+                      [15, 7, 13, 5]], dtype=np.float32) / 16 - 0.5
+
+
+def sample_pixels(image, max_sample=MAX_SAMPLE, seed=0):
+    """
+    Выбирает случайную подвыборку пикселей изображения.
+
+    Args:
+        image (numpy.ndarray): Изображение в формате RGB.
+        max_sample (int): Максимальный размер подвыборки.
+        seed (int): Зерно генератора случайных чисел.
+
+    Returns:
+        numpy.ndarray: Массив пикселей формы (N, 3), float32.
+    """
+    pixels = np.asarray(image).reshape(-1, 3)
+    if len(pixels) > max_sample:
+        rng = np.random.default_rng(seed)
+        pixels = pixels[rng.choice(len(pixels), max_sample, replace=False)]
+    return pixels.astype(np.float32)
+
+
+def median_cut_palette(pixels, n_colors):
+    """
+    Строит палитру методом медианного сечения.
+
+    На каждом шаге делится «коробка» с наибольшим разбросом по самому широкому каналу.
+
+    Args:
+        pixels (numpy.ndarray): Пиксели формы (N, 3).
+        n_colors (int): Размер палитры.
+
+    Returns:
+        numpy.ndarray: Палитра формы (K, 3), float32 (K <= n_colors).
+    """
+    boxes = [pixels]
+    while len(boxes) < n_colors:
+        spreads = [np.ptp(box, axis=0).max() * len(box) if len(box) > 1 else -1 for box in boxes]
+        widest = int(np.argmax(spreads))
+        if spreads[widest] <= 0:
+            break
+        box = boxes.pop(widest)
+        channel = int(np.argmax(np.ptp(box, axis=0)))
+        order = np.argsort(box[:, channel], kind='stable')
+        half = len(box) // 2
+        boxes += [box[order[:half]], box[order[half:]]]
+    return np.array([box.mean(axis=0) for box in boxes], dtype=np.float32)
+
+
+def nearest_color(pixels, palette):
+    """
+    Находит ближайший цвет палитры для каждого пикселя (перцептивное расстояние).
+
+    Args:
+        pixels (numpy.ndarray): Пиксели формы (N, 3).
+        palette (numpy.ndarray): Палитра формы (K, 3).
+
+    Returns:
+        numpy.ndarray: Индексы цветов палитры формы (N,).
+    """
+    weighted_pixels = pixels * PERCEPTUAL_WEIGHTS
+    weighted_palette = palette * PERCEPTUAL_WEIGHTS
+    distances = ((weighted_pixels[:, None, :] - weighted_palette[None, :, :]) ** 2).sum(axis=2)
+    return distances.argmin(axis=1)
+
+
+def kmeans_palette(pixels, n_colors, iterations=30, batch_size=1024, seed=0):
+    """
+    Строит палитру мини-пакетным k-means (начальные центры — медианное сечение).
+
+    Args:
+        pixels (numpy.ndarray): Пиксели формы (N, 3).
+        n_colors (int): Размер палитры.
+        iterations (int): Количество мини-пакетов.
+        batch_size (int): Размер мини-пакета.
+        seed (int): Зерно генератора случайных чисел.
+
+    Returns:
+        numpy.ndarray: Палитра формы (K, 3), float32.
+    """
+    rng = np.random.default_rng(seed)
+    centers = median_cut_palette(pixels, n_colors)
+    counts = np.zeros(len(centers), dtype=np.float32)
+    for _ in range(iterations):
+        batch = pixels[rng.integers(0, len(pixels), min(batch_size, len(pixels)))]
+        labels = nearest_color(batch, centers)
+        batch_counts = np.bincount(labels, minlength=len(centers)).astype(np.float32)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, batch)
+        counts += batch_counts
+        updated = batch_counts > 0
+        # Шаг обучения 1/count для каждого центра (Sculley, 2010)
+        rate = batch_counts[updated] / counts[updated]
+        centers[updated] += rate[:, None] * (sums[updated] / batch_counts[updated, None] - centers[updated])
+    return centers
+
+
+def build_lut(palette, bits=LUT_BITS):
+    """
+    Строит трёхмерную таблицу поиска: квантованный RGB -> индекс ближайшего цвета палитры.
+
+    Args:
+        palette (numpy.ndarray): Палитра формы (K, 3).
+        bits (int): Бит на канал в таблице (по умолчанию 5, т.е. 32x32x32).
+
+    Returns:
+        numpy.ndarray: Таблица формы (2^bits, 2^bits, 2^bits), uint8.
+    """
+    levels = 1 << bits
+    step = 256 // levels
+    centers = np.arange(levels, dtype=np.float32) * step + step / 2
+    green, blue = np.meshgrid(centers, centers, indexing='ij')
+    lut = np.empty((levels, levels, levels), dtype=np.uint8)
+    for red_index, red in enumerate(centers):
+        plane = np.stack([np.full_like(green, red), green, blue], axis=-1).reshape(-1, 3)
+        lut[red_index] = nearest_color(plane, palette).reshape(levels, levels)
+    return lut
+
+
+def ordered_dither(image, strength):
+    """
+    Применяет упорядоченный дизеринг (матрица Байера 4x4).
+
+    Args:
+        image (numpy.ndarray): Изображение формы (H, W, 3).
+        strength (float): Амплитуда шума в единицах яркости.
+
+    Returns:
+        numpy.ndarray: Изображение с дизерингом, uint8.
+    """
+    height, width = image.shape[:2]
+    threshold = np.tile(BAYER_4X4, (height // 4 + 1, width // 4 + 1))[:height, :width]
+    return np.clip(image + threshold[:, :, None] * strength, 0, 255).astype(np.uint8)
+
+
+class AdaptivePalette:
+    """
+    Адаптивная палитра изображения с таблицей поиска для быстрого сопоставления цветов.
+
+    Палитра строится по подвыборке пикселей (медианное сечение или мини-пакетный k-means),
+    после чего каждый пиксель сопоставляется с цветом палитры за O(1) через таблицу 32x32x32.
+
+    Args:
+        image (numpy.ndarray): Изображение в формате RGB.
+        n_colors (int): Размер палитры (не больше 256, по умолчанию 16).
+        method (str): 'median-cut' или 'kmeans' (по умолчанию 'median-cut').
+
+    Attributes:
+        colors (numpy.ndarray): Цвета палитры формы (K, 3), uint8.
+        lut (numpy.ndarray): Таблица поиска индексов.
+    """
+    def __init__(self, image, n_colors=16, method='median-cut'):
+        if not 1 <= n_colors <= 256:
+            raise ValueError(f"Palette size must be between 1 and 256, got {n_colors}.")
+        pixels = sample_pixels(image)
+        if method == 'median-cut':
+            palette = median_cut_palette(pixels, n_colors)
+        elif method == 'kmeans':
+            palette = kmeans_palette(pixels, n_colors)
+        else:
+            raise ValueError(f"Unknown palette method: {method}.")
+        self.colors = np.clip(np.rint(palette), 0, 255).astype(np.uint8)
+        self.lut = build_lut(self.colors.astype(np.float32))
+        # Примерно половина среднего расстояния между соседними цветами палитры
+        self.dither_strength = 128 / max(2.0, len(self.colors) ** (1 / 3))
+
+    def map(self, image, dither=False):
+        """
+        Сопоставляет пиксели изображения с цветами палитры.
+
+        Args:
+            image (numpy.ndarray): Изображение формы (H, W, 3) в формате RGB.
+            dither (bool): Применить упорядоченный дизеринг (по умолчанию False).
+
+        Returns:
+            numpy.ndarray: Индексы цветов палитры формы (H, W).
+        """
+        if dither:
+            image = ordered_dither(image, self.dither_strength)
+        indices = np.asarray(image) >> (8 - LUT_BITS)
+        return self.lut[indices[..., 0], indices[..., 1], indices[..., 2]]
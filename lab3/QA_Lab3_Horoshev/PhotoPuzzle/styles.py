@@ -0,0 +1,97 @@
+import importlib
+from importlib import metadata
+
+ENTRY_POINT_GROUP = 'photopuzzle.styles'
+# Стиль -> где находится класс («модуль:Класс») и его параметры.
+# Модуль стиля импортируется только при первом выборе стиля.
+STYLE_REGISTRY = {
+    'ASCII': {'target': 'ascii:ArtASCIIGray', 'size_param': 'font_size', 'color': False},
+    'ASCII Color': {'target': 'ascii:ArtASCIIColor', 'size_param': 'font_size', 'color': True},
+    'PIXEL': {'target': 'pixel:ArtPixelGray', 'size_param': 'pixel_size', 'color': False},
+    'PIXEL Color': {'target': 'pixel:ArtPixelColor', 'size_param': 'pixel_size', 'color': True},
+}
+_loaded_styles = {}
+_entry_points_discovered = False
+
+
+def register_style(name, target, size_param='pixel_size', color=False):
+    """
+    Регистрирует стиль без импорта его модуля.
+
+    Args:
+        name (str): Название стиля (надпись в меню).
+        target (str or importlib.metadata.EntryPoint): «модуль:Класс» или точка входа.
+        size_param (str): Имя параметра размера символа/пикселя (по умолчанию 'pixel_size').
+        color (bool): Поддерживает ли стиль параметр color_lvl (по умолчанию False).
+    """
+    STYLE_REGISTRY[name] = {'target': target, 'size_param': size_param, 'color': color}
+    _loaded_styles.pop(name, None)
+
+
+def discover_styles():
+    """
+    Добавляет стили из точек входа группы 'photopuzzle.styles' установленных пакетов.
+
+    Читаются только метаданные пакетов, сами модули не импортируются.
+    Стили, уже зарегистрированные под тем же именем, не заменяются.
+    """
+    global _entry_points_discovered
+    if _entry_points_discovered:
+        return
+    _entry_points_discovered = True
+    for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name not in STYLE_REGISTRY:
+            register_style(entry_point.name, entry_point)
+
+
+def style_names():
+    """
+    Возвращает названия всех доступных стилей в порядке регистрации.
+
+    Returns:
+        list: Названия стилей.
+    """
+    discover_styles()
+    return list(STYLE_REGISTRY)
+
+
+def style_info(name):
+    """
+    Возвращает параметры стиля.
+
+    Args:
+        name (str): Название стиля.
+
+    Returns:
+        dict: Параметры стиля ('target', 'size_param', 'color').
+
+    Raises:
+        ValueError: Если стиль не зарегистрирован.
+    """
+    discover_styles()
+    if name not in STYLE_REGISTRY:
+        raise ValueError(f"Unknown art style: {name}.")
+    return STYLE_REGISTRY[name]
+
+
+def load_style(name):
+    """
+    Импортирует модуль стиля (при первом обращении) и возвращает класс стиля.
+
+    Args:
+        name (str): Название стиля.
+
+    Returns:
+        type: Класс стиля (ArtASCII* или ArtPixel*).
+
+    Raises:
+        ValueError: Если стиль не зарегистрирован.
+    """
+    if name not in _loaded_styles:
+        target = style_info(name)['target']
+        if isinstance(target, str):
+            module_name, class_name = target.split(':')
+            _loaded_styles[name] = getattr(importlib.import_module(module_name), class_name)
+        else:
+            _loaded_styles[name] = target.load()
+    return _loaded_styles[name]
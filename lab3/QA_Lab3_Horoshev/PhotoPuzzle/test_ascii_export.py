@@ -0,0 +1,99 @@
+import io
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import unittest
+import numpy as np
+import cv2
+from ascii_export import ANSI_RESET, ansi256_codes, color_prefixes, format_lines, export_image
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestFormatLines(unittest.TestCase):
+
+    def setUp(self):
+        self.chars = ' .<&'
+        self.char_indices = np.array([[0, 1, 2], [3, 3, 1]])
+        self.colors = np.array([[[255, 0, 0], [255, 0, 0], [0, 0, 255]],
+                                [[0, 0, 0], [0, 0, 0], [0, 0, 0]]], dtype=np.uint8)
+
+    def test_text(self):
+        self.assertEqual(list(format_lines(self.char_indices, self.chars)), [' .<', '&&.'])
+
+    def test_ansi256(self):
+        lines = list(format_lines(self.char_indices, self.chars, 'ansi256', self.colors))
+        self.assertEqual(lines, ['\x1b[38;5;196m .\x1b[38;5;21m<' + ANSI_RESET,
+                                 '\x1b[38;5;16m&&.' + ANSI_RESET])
+
+    def test_html_escaping_and_no_blank_lines(self):
+        lines = list(format_lines(self.char_indices, self.chars, 'html', self.colors))
+        self.assertEqual(lines, [
+            '<pre style="background:#000;color:#fff;line-height:1"><span></span><span style="color:#ff0000">'
+            ' .</span><span style="color:#0000ff">&lt;',
+            '</span><span style="color:#000000">&amp;&amp;.</span></pre>'])
+
+    def test_html_single_row(self):
+        lines = list(format_lines(np.array([[1]]), self.chars, 'html', np.zeros((1, 1, 3), dtype=np.uint8)))
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith('<pre') and lines[0].endswith('</pre>'))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(format_lines(self.char_indices, self.chars, 'rtf'))
+
+
+class TestColorPrefixes(unittest.TestCase):
+
+    def test_prefix_only_on_change(self):
+        colors = np.array([[1, 2, 3], [1, 2, 3], [4, 5, 6], [4, 5, 6], [1, 2, 3]], dtype=np.uint8)
+        self.assertEqual(color_prefixes(colors, 'truecolor').tolist(),
+                         ['\x1b[38;2;1;2;3m', '', '\x1b[38;2;4;5;6m', '', '\x1b[38;2;1;2;3m'])
+
+    def test_ansi256_prefix_on_code_change(self):
+        # Близкие цвета попадают в один код ANSI 256, поэтому префикс не повторяется
+        colors = np.array([[250, 250, 250], [255, 255, 255], [0, 0, 0]], dtype=np.uint8)
+        self.assertEqual(ansi256_codes(colors).tolist(), [231, 231, 16])
+        self.assertEqual(color_prefixes(colors, 'ansi256').tolist(), ['\x1b[38;5;231m', '', '\x1b[38;5;16m'])
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'image.png')
+        gradient = np.tile(np.linspace(0, 255, 200, dtype=np.uint8), (100, 1))
+        cv2.imwrite(self.path, cv2.merge([gradient] * 3))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_export_text(self):
+        stream = io.StringIO()
+        export_image(self.path, stream, 'gray', 'text', columns=40)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 10)
+        self.assertTrue(all(len(line) == 40 for line in lines))
+        self.assertEqual(lines[0][0], ' ')
+        self.assertEqual(lines[0][-1], '@')
+
+    def test_export_does_not_import_pygame(self):
+        result = subprocess.run([sys.executable, '-c', 'import sys, ascii_export; print("pygame" in sys.modules)'],
+                                cwd=APP_DIR, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    def test_cli_closed_pipe(self):
+        # Вывод больше буфера канала; читатель закрывает канал после первых байт, как head
+        process = subprocess.Popen([sys.executable, 'ascii_export.py', self.path, '--format', 'truecolor',
+                                    '--columns', '300'], cwd=APP_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        process.stdout.read(100)
+        process.stdout.close()
+        stderr = process.stderr.read().decode()
+        process.wait()
+        self.assertNotIn('Traceback', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
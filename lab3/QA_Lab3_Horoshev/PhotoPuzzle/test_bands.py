@@ -0,0 +1,27 @@
+import os
+import unittest
+from unittest import mock
+from bands import default_workers, band_ranges
+
+
+class TestDefaultWorkers(unittest.TestCase):
+
+    def test_number(self):
+        with mock.patch.dict(os.environ, {'PHOTOPUZZLE_WORKERS': '3'}):
+            self.assertEqual(default_workers(), 3)
+
+    def test_invalid_value_uses_cpu_count(self):
+        for value in ('abc', '', '0', '-2', '1.5'):
+            with self.subTest(value=value), mock.patch.dict(os.environ, {'PHOTOPUZZLE_WORKERS': value}):
+                self.assertEqual(default_workers(), os.cpu_count() or 1)
+
+
+class TestBandRanges(unittest.TestCase):
+
+    def test_aligned_bands_cover_all_rows(self):
+        ranges = band_ranges(50, 4, align=4)
+        self.assertEqual(ranges, [(0, 16), (16, 32), (32, 48), (48, 50)])
+
+
+if __name__ == '__main__':
+    unittest.main()
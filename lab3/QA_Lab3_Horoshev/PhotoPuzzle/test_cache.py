@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from cache import ConvertedCache
+
+
+class TestConvertedCache(unittest.TestCase):
+
+    def setUp(self):
+        # Для каждого теста создаётся временная папка с исходником и кэшем
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.source = self.write('source.jpg', b'image data')
+        self.array = np.arange(1000, dtype=np.uint16).reshape(20, 50)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def entry_size(self):
+        cache = ConvertedCache(os.path.join(self.tmp_dir, 'probe'))
+        cache.save('probe', 'image', self.array)
+        return cache.index['entries']['probe_image.npy']['size']
+
+    def test_key_is_stable(self):
+        cache = ConvertedCache(self.cache_dir)
+        key = cache.make_key(self.source, style='ArtPixelGray', pixel_size=5, screen_res=(800, 600))
+        cache.save(key, 'image', self.array)
+        # Новый экземпляр читает индекс с диска; порядок параметров не важен
+        reopened = ConvertedCache(self.cache_dir)
+        self.assertEqual(reopened.make_key(self.source, screen_res=(800, 600), pixel_size=5, style='ArtPixelGray'), key)
+        # Переименование файла не меняет ключ, а другие параметры — меняют
+        renamed = shutil.copy(self.source, os.path.join(self.tmp_dir, 'renamed.jpg'))
+        self.assertEqual(reopened.make_key(renamed, style='ArtPixelGray', pixel_size=5, screen_res=(800, 600)), key)
+        self.assertNotEqual(reopened.make_key(self.source, style='ArtPixelGray', pixel_size=6,
+                                              screen_res=(800, 600)), key)
+
+    def test_key_changes_with_content(self):
+        cache = ConvertedCache(self.cache_dir)
+        key = cache.make_key(self.source, pixel_size=5)
+        with open(self.source, 'ab') as file:
+            file.write(b' edited')
+        os.utime(self.source, ns=(0, 10 ** 9))
+        self.assertNotEqual(cache.make_key(self.source, pixel_size=5), key)
+
+    def test_round_trip(self):
+        cache = ConvertedCache(self.cache_dir)
+        cache.save('key', 'image', self.array)
+        np.testing.assert_array_equal(ConvertedCache(self.cache_dir).load('key', 'image'), self.array)
+
+    def test_lru_eviction(self):
+        cache = ConvertedCache(self.cache_dir, max_bytes=2 * self.entry_size())
+        cache.save('a', 'image', self.array)
+        cache.save('b', 'image', self.array)
+        cache.index['entries']['a_image.npy']['last_access'] = 2
+        cache.index['entries']['b_image.npy']['last_access'] = 1
+        cache.save('c', 'image', self.array)
+        self.assertEqual(sorted(cache.index['entries']), ['a_image.npy', 'c_image.npy'])
+        self.assertFalse(os.path.exists(cache.entry_path('b', 'image')))
+
+    def test_corrupted_entry_is_removed(self):
+        ConvertedCache(self.cache_dir).save('key', 'image', self.array)
+        path = os.path.join(self.cache_dir, 'key_image.npy')
+        # Последний байт меняется без изменения размера файла
+        with open(path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))
+        cache = ConvertedCache(self.cache_dir)
+        self.assertIsNone(cache.load('key', 'image'))
+        self.assertFalse(os.path.exists(path))
+        self.assertNotIn('key_image.npy', ConvertedCache(self.cache_dir).index['entries'])
+
+    def test_verify(self):
+        cache = ConvertedCache(self.cache_dir)
+        cache.save('a', 'image', self.array)
+        cache.save('b', 'image', self.array)
+        with open(os.path.join(self.cache_dir, 'b_image.npy'), 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'\x00' if file.read(1) != b'\x00' else b'\x01')
+        self.assertEqual(ConvertedCache(self.cache_dir).verify(), 1)
+
+    def test_busy_entry_is_skipped(self):
+        # На Windows файл, открытый через mmap, нельзя удалить
+        cache = ConvertedCache(self.cache_dir, max_bytes=self.entry_size())
+        cache.save('a', 'image', self.array)
+        with mock.patch('cache.os.remove', side_effect=PermissionError("file is in use")):
+            cache.save('b', 'image', self.array)
+        self.assertIn('a_image.npy', cache.index['entries'])
+        cache.save('c', 'image', self.array)
+        self.assertEqual(list(cache.index['entries']), ['c_image.npy'])
+
+    def test_failed_save_returns_array(self):
+        cache = ConvertedCache(self.cache_dir)
+        with mock.patch.object(cache, 'save', side_effect=PermissionError("read-only")):
+            array = cache.get_or_create('key', 'image', lambda: self.array)
+        np.testing.assert_array_equal(array, self.array)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import cv2
+from cache import ConvertedCache
+from loader import read_image_size, load_image
+
+
+class TestReadImageSize(unittest.TestCase):
+
+    def setUp(self):
+        # Для каждого теста создаётся временная папка с изображениями
+        self.tmp_dir = tempfile.mkdtemp()
+        image = np.zeros((20, 30, 3), dtype=np.uint8)
+        self.jpeg_bytes = cv2.imencode('.jpg', image)[1].tobytes()
+        self.png_bytes = cv2.imencode('.png', image)[1].tobytes()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_png_size(self):
+        self.assertEqual(read_image_size(self.write('image.png', self.png_bytes)), (30, 20))
+
+    def test_jpeg_size(self):
+        self.assertEqual(read_image_size(self.write('image.jpg', self.jpeg_bytes)), (30, 20))
+
+    def test_jpeg_exif_rotation(self):
+        # Orientation=6 (поворот на 90°): cv2.imread меняет ширину и высоту местами
+        ifd = (b'MM\x00*' + struct.pack('>IH', 8, 1) + struct.pack('>HHIHH', 0x0112, 3, 1, 6, 0)
+               + struct.pack('>I', 0))
+        segment = b'Exif\x00\x00' + ifd
+        app1 = b'\xff\xe1' + struct.pack('>H', len(segment) + 2) + segment
+        path = self.write('rotated.jpg', self.jpeg_bytes[:2] + app1 + self.jpeg_bytes[2:])
+        self.assertEqual(read_image_size(path), (20, 30))
+        self.assertEqual(cv2.imread(path).shape[1::-1], (20, 30))
+
+    def test_unknown_format(self):
+        self.assertIsNone(read_image_size(self.write('image.txt', b'not an image at all')))
+
+    def test_truncated_jpeg_frame_header(self):
+        # Файл обрывается сразу после маркера SOF и его длины
+        sof = self.jpeg_bytes.index(b'\xff\xc0')
+        path = self.write('truncated.jpg', self.jpeg_bytes[:sof + 6])
+        self.assertIsNone(read_image_size(path))
+
+    def test_truncated_jpeg_segment(self):
+        self.assertIsNone(read_image_size(self.write('truncated.jpg', self.jpeg_bytes[:5])))
+
+    def test_invalid_segment_length(self):
+        path = self.write('broken.jpg', b'\xff\xd8\xff\xe0\x00\x00' + b'\x00' * 16)
+        self.assertIsNone(read_image_size(path))
+
+    def test_load_truncated_jpeg(self):
+        # Повреждённый файл даёт документированную ошибку, а не struct.error
+        sof = self.jpeg_bytes.index(b'\xff\xc0')
+        path = self.write('truncated.jpg', self.jpeg_bytes[:sof + 6])
+        with self.assertRaises(FileNotFoundError):
+            load_image(path, (800, 600))
+
+
+class TestLoadImageCache(unittest.TestCase):
+
+    def setUp(self):
+        # Порог «большого» изображения снижен, кэш приложения подменён временным
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'image.png')
+        cv2.imwrite(self.path, np.random.default_rng(0).integers(0, 256, (40, 60, 3), dtype=np.uint8))
+        self.cache = ConvertedCache(os.path.join(self.tmp_dir, 'cache'))
+        patches = [mock.patch('loader.LARGE_IMAGE_PIXELS', 100),
+                   mock.patch('loader.default_cache', return_value=self.cache)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_large_image_is_cached(self):
+        image = load_image(self.path, (60, 40))
+        self.assertEqual(len(self.cache.index['entries']), 1)
+        cached = load_image(self.path, (60, 40))
+        self.assertIsInstance(cached, np.memmap)
+        np.testing.assert_array_equal(cached, image)
+
+    def test_edited_source_entry_is_evicted(self):
+        load_image(self.path, (60, 40))
+        self.cache.max_bytes = max(entry['size'] for entry in self.cache.index['entries'].values())
+        cv2.imwrite(self.path, np.zeros((40, 60, 3), dtype=np.uint8))
+        os.utime(self.path, ns=(0, 10 ** 9))
+        self.assertEqual(load_image(self.path, (60, 40)).max(), 0)
+        self.assertEqual(len(self.cache.index['entries']), 1)
+
+    def test_failed_cache_write_returns_image(self):
+        with mock.patch('cache.np.save', side_effect=PermissionError("read-only")):
+            image = load_image(self.path, (60, 40))
+        self.assertEqual(image.shape, (40, 60, 3))
+        self.assertEqual(self.cache.index['entries'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import random
+import unittest
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame as pg
+from puzzle import PuzzleBoard
+
+
+class TestPuzzleBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.board = PuzzleBoard(pg.Surface((400, 300)), rows=6, cols=8, board_size=(800, 600), snap_distance=12)
+
+    def topmost(self, pos):
+        # Линейный перебор порядка отрисовки: последний подходящий фрагмент — верхний
+        for piece in reversed(self.board.order):
+            if piece.rect().collidepoint(pos):
+                return piece
+        return None
+
+    def assert_piece_at_matches_scan(self, rng):
+        for _ in range(2000):
+            pos = (rng.randrange(-20, 820), rng.randrange(-20, 620))
+            self.assertIs(self.board.piece_at(pos), self.topmost(pos), pos)
+
+    def test_piece_at_after_shuffle(self):
+        rng = random.Random(1)
+        for seed in range(5):
+            self.board.shuffle(seed)
+            self.assert_piece_at_matches_scan(rng)
+
+    def test_piece_at_after_move(self):
+        rng = random.Random(2)
+        self.board.shuffle(3)
+        piece = self.board.order[0]
+        self.board.bring_to_front(piece.group)
+        self.board.move_group(piece.group, 37.4, -11.6)
+        self.assertIs(self.board.order[-1], piece)
+        self.assert_piece_at_matches_scan(rng)
+
+    def test_shuffle_is_reproducible(self):
+        self.board.shuffle(7)
+        positions = [(piece.x, piece.y) for piece in self.board.pieces]
+        order = [piece.index for piece in self.board.order]
+        self.board.shuffle(7)
+        self.assertEqual([(piece.x, piece.y) for piece in self.board.pieces], positions)
+        self.assertEqual([piece.index for piece in self.board.order], order)
+
+    def test_snap_neighbours_within_distance(self):
+        self.board.shuffle(4)
+        left, right = self.board.pieces[0], self.board.pieces[1]
+        left.x, left.y = 100, 100
+        right.x, right.y = 100 + self.board.piece_width + 5, 100 - 7
+        self.board.index_piece(left)
+        self.board.index_piece(right)
+        group = self.board.snap(right.group)
+        self.assertEqual(left.group, right.group)
+        self.assertEqual(group, left.group)
+        self.assertEqual((right.x - left.x, right.y - left.y), (self.board.piece_width, 0))
+        self.assertEqual(len(self.board.groups), len(self.board.pieces) - 1)
+        self.assertIs(self.board.piece_at((right.x + 1, right.y + 1)), right)
+
+    def test_no_snap_beyond_distance(self):
+        self.board.shuffle(4)
+        left, right = self.board.pieces[0], self.board.pieces[1]
+        left.x, left.y = 100, 100
+        right.x, right.y = 100 + self.board.piece_width + 10, 100 + 10
+        self.board.index_piece(left)
+        self.board.index_piece(right)
+        self.board.snap(right.group)
+        self.assertNotEqual(left.group, right.group)
+
+    def test_solved(self):
+        self.board.shuffle(5)
+        self.assertFalse(self.board.solved())
+        # Каждый фрагмент кладётся рядом со своим местом и стыкуется
+        for piece in self.board.pieces:
+            piece.x = piece.col * self.board.piece_width + 3
+            piece.y = piece.row * self.board.piece_height - 2
+            self.board.index_piece(piece)
+        for piece in self.board.pieces:
+            self.board.snap(piece.group)
+        self.assertTrue(self.board.solved())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from quantize import AdaptivePalette, LUT_BITS, nearest_color, median_cut_palette, kmeans_palette, sample_pixels
+
+
+class TestAdaptivePalette(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+
+    def test_map_matches_nearest_color_on_cell_centres(self):
+        # Центры ячеек таблицы поиска: таблица должна давать тот же цвет, что и полный перебор
+        step = 256 >> LUT_BITS
+        centres = np.arange(1 << LUT_BITS) * step + step // 2
+        grid = np.stack(np.meshgrid(centres, centres, centres, indexing='ij'), axis=-1).astype(np.uint8)
+        for method in ('median-cut', 'kmeans'):
+            with self.subTest(method=method):
+                palette = AdaptivePalette(self.image, 16, method)
+                expected = nearest_color(grid.reshape(-1, 3).astype(np.float32), palette.colors.astype(np.float32))
+                np.testing.assert_array_equal(palette.map(grid).reshape(-1), expected)
+
+    def test_palette_size_limit(self):
+        pixels = sample_pixels(self.image)
+        for n_colors in (1, 2, 5, 16, 64):
+            with self.subTest(n_colors=n_colors):
+                self.assertLessEqual(len(median_cut_palette(pixels, n_colors)), n_colors)
+                self.assertLessEqual(len(kmeans_palette(pixels, n_colors)), n_colors)
+                self.assertLessEqual(len(AdaptivePalette(self.image, n_colors, 'kmeans').colors), n_colors)
+
+    def test_single_colour_image(self):
+        image = np.full((20, 30, 3), (10, 200, 30), dtype=np.uint8)
+        for method in ('median-cut', 'kmeans'):
+            for n_colors in (1, 16):
+                with self.subTest(method=method, n_colors=n_colors):
+                    palette = AdaptivePalette(image, n_colors, method)
+                    self.assertEqual(palette.colors.tolist(), [[10, 200, 30]])
+                    self.assertTrue((palette.map(image, dither=True) == 0).all())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AdaptivePalette(self.image, 0)
+        with self.assertRaises(ValueError):
+            AdaptivePalette(self.image, 16, 'octree')
+
+
+if __name__ == '__main__':
+    unittest.main()
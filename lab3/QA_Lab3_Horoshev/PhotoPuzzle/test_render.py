@@ -0,0 +1,38 @@
+import os
+import unittest
+import numpy as np
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame as pg
+from styles import STYLE_REGISTRY, load_style
+
+
+class TestBandRender(unittest.TestCase):
+
+    def setUp(self):
+        # Серый шум: в каждой полосе map_image встречаются все символы
+        gray = np.random.default_rng(0).integers(0, 256, (300, 400, 1), dtype=np.uint8)
+        self.frame = np.repeat(gray, 3, axis=2)
+
+    def render(self, name, workers, **kwargs):
+        art = load_style(name)(None, screen_res=(400, 300), workers=workers, **kwargs)
+        art.cache = None
+        art.set_frame(self.frame)
+        return pg.surfarray.array3d(art.render_converted_image())
+
+    def test_workers_give_same_image(self):
+        # Разбиение на полосы не должно менять результат ни у одного стиля
+        for name in STYLE_REGISTRY:
+            with self.subTest(style=name):
+                np.testing.assert_array_equal(self.render(name, 1), self.render(name, 4))
+
+    def test_workers_give_same_image_with_dither(self):
+        for name in ('ASCII Color', 'PIXEL Color'):
+            with self.subTest(style=name):
+                options = dict(palette_method='kmeans', dither=True)
+                np.testing.assert_array_equal(self.render(name, 1, **options), self.render(name, 3, **options))
+
+
+if __name__ == '__main__':
+    unittest.main()
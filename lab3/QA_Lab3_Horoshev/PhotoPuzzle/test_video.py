@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import cv2
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+from styles import STYLE_REGISTRY, load_style
+from video import VideoArt
+
+
+class TestVideoArt(unittest.TestCase):
+
+    def setUp(self):
+        # Короткий ролик с меняющейся яркостью записывается во временную папку
+        self.tmp_dir = tempfile.mkdtemp()
+        self.clip_path = os.path.join(self.tmp_dir, 'clip.avi')
+        writer = cv2.VideoWriter(self.clip_path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (160, 120))
+        for i in range(10):
+            frame = np.full((120, 160, 3), i * 25, dtype=np.uint8)
+            cv2.rectangle(frame, (i * 10, 30), (i * 10 + 40, 90), (0, 0, 255), -1)
+            writer.write(frame)
+        writer.release()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_every_style_plays_file(self):
+        for name in STYLE_REGISTRY:
+            with self.subTest(style=name):
+                video = VideoArt(load_style(name), self.clip_path, screen_res=(160, 120))
+                video.run()
+                self.assertIsInstance(video.dropped_frames, int)
+                self.assertIs(video.art.surface, video.surface)
+
+    def test_missing_file(self):
+        video = VideoArt(load_style('PIXEL'), os.path.join(self.tmp_dir, 'missing.avi'), screen_res=(160, 120))
+        with self.assertRaises(FileNotFoundError):
+            video.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
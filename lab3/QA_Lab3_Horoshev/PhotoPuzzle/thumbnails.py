@@ -0,0 +1,196 @@
+import os
+import json
+import queue
+import hashlib
+import threading
+import cv2
+from loader import load_image, CACHE_DIR_NAME
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+class ThumbnailIndex:
+    """
+    Постоянный индекс миниатюр для папки с изображениями.
+
+    Список файлов обновляется инкрементально: папка перечитывается только при изменении
+    её времени модификации. Миниатюры строятся в фоновом потоке (с уменьшенным
+    декодированием) и сохраняются в photo/.cache/thumbs вместе с index.json, поэтому
+    при следующем запуске готовые миниатюры просто читаются с диска.
+
+    Args:
+        path (str): Папка с изображениями (по умолчанию "photo").
+        thumb_size (tuple): Максимальный размер миниатюры (по умолчанию (48, 48)).
+
+    Attributes:
+        images (list): Отсортированный список путей к изображениям.
+        thumbnails (dict): Готовые миниатюры (путь -> numpy.ndarray в формате RGB).
+        pending (set): Пути, которые уже стоят в очереди фонового потока.
+    """
+    def __init__(self, path="photo", thumb_size=(48, 48)):
+        self.PATH = path
+        self.thumb_size = thumb_size
+        self.thumbs_dir = os.path.join(path, CACHE_DIR_NAME, 'thumbs')
+        self.index_path = os.path.join(self.thumbs_dir, 'index.json')
+        self.images = []
+        self.thumbnails = {}
+        self.dir_mtime = None
+        self.lock = threading.Lock()
+        self.tasks = queue.Queue()
+        self.pending = set()
+        self.index = self.load_index()
+        self.worker = threading.Thread(target=self.build_thumbnails, daemon=True)
+        self.worker.start()
+
+    def load_index(self):
+        """
+        Загружает индекс миниатюр с диска.
+
+        Returns:
+            dict: Индекс (имя файла -> [размер, время изменения, файл миниатюры]).
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        """
+        Атомарно сохраняет индекс миниатюр на диск.
+        """
+        os.makedirs(self.thumbs_dir, exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with self.lock:
+            data = json.dumps(self.index)
+        with open(tmp_path, 'w', encoding='utf-8') as index_file:
+            index_file.write(data)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self):
+        """
+        Обновляет список изображений, если папка изменилась.
+
+        Returns:
+            bool: True, если список изменился.
+
+        Raises:
+            FileNotFoundError: Если папка не найдена.
+        """
+        dir_mtime = os.stat(self.PATH).st_mtime_ns
+        if dir_mtime == self.dir_mtime:
+            return False
+        self.dir_mtime = dir_mtime
+        images = sorted(os.path.join(self.PATH, img) for img in os.listdir(self.PATH)
+                        if img.lower().endswith(IMAGE_EXTENSIONS))
+        known = set(self.images)
+        for img_path in images:
+            if img_path not in known or img_path not in self.thumbnails:
+                self.enqueue(img_path)
+        self.images = images
+        return True
+
+    def enqueue(self, img_path):
+        """
+        Ставит изображение в очередь фонового потока, если оно ещё не ожидает обработки.
+
+        Args:
+            img_path (str): Путь к изображению.
+        """
+        with self.lock:
+            if img_path in self.pending:
+                return
+            self.pending.add(img_path)
+        self.tasks.put(img_path)
+
+    def build_thumbnails(self):
+        """
+        Фоновый поток: загружает миниатюры из индекса или строит новые.
+
+        Ошибка на одном файле выводится и не останавливает поток.
+        """
+        while True:
+            img_path = self.tasks.get()
+            try:
+                thumbnail = self.load_thumbnail(img_path)
+                if thumbnail is not None:
+                    self.thumbnails[img_path] = thumbnail
+            except Exception as e:
+                print(f"Thumbnail for {img_path} failed: {e!r}")
+            finally:
+                with self.lock:
+                    self.pending.discard(img_path)
+            if self.tasks.empty():
+                try:
+                    self.save_index()
+                except OSError as e:
+                    print(f"Thumbnail index was not saved: {e}")
+
+    def add(self, img_path):
+        """
+        Сразу строит миниатюру для нового изображения и сохраняет индекс.
+
+        Args:
+            img_path (str): Путь к изображению.
+        """
+        thumbnail = self.load_thumbnail(img_path)
+        if thumbnail is not None:
+            self.thumbnails[img_path] = thumbnail
+        self.save_index()
+
+    def load_thumbnail(self, img_path):
+        """
+        Возвращает миниатюру изображения, создавая её при необходимости.
+
+        Args:
+            img_path (str): Путь к изображению.
+
+        Returns:
+            numpy.ndarray or None: Миниатюра в формате RGB или None, если изображение не читается.
+        """
+        stat = os.stat(img_path)
+        name = os.path.basename(img_path)
+        with self.lock:
+            entry = self.index.get(name)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            thumbnail = cv2.imread(os.path.join(self.thumbs_dir, entry[2]))
+            if thumbnail is not None:
+                return cv2.cvtColor(thumbnail, cv2.COLOR_BGR2RGB)
+        try:
+            image = load_image(img_path, self.thumb_size, use_cache=False)
+        except FileNotFoundError:
+            return None
+        height, width = image.shape[:2]
+        scale = min(self.thumb_size[0] / width, self.thumb_size[1] / height)
+        thumbnail = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+        thumb_file = hashlib.sha1(f"{name}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest() + '.png'
+        os.makedirs(self.thumbs_dir, exist_ok=True)
+        cv2.imwrite(os.path.join(self.thumbs_dir, thumb_file), thumbnail)
+        with self.lock:
+            old_entry = self.index.get(name)
+            self.index[name] = [stat.st_size, stat.st_mtime_ns, thumb_file]
+        if old_entry and old_entry[2] != thumb_file:
+            try:
+                os.remove(os.path.join(self.thumbs_dir, old_entry[2]))
+            except FileNotFoundError:
+                pass
+        return cv2.cvtColor(thumbnail, cv2.COLOR_BGR2RGB)
+
+
+_thumbnail_indexes = {}
+
+
+def thumbnail_index(path="photo"):
+    """
+    Возвращает общий индекс миниатюр для папки (создаётся при первом обращении).
+
+    Args:
+        path (str): Папка с изображениями.
+
+    Returns:
+        ThumbnailIndex: Индекс миниатюр.
+    """
+    if path not in _thumbnail_indexes:
+        _thumbnail_indexes[path] = ThumbnailIndex(path)
+    return _thumbnail_indexes[path]
@@ -0,0 +1,164 @@
+import queue
+import sys
+import threading
+import time
+import pygame as pg
+import cv2
+
+class VideoArt:
+    """
+    Потоковая обработка видео (файл или веб-камера) в одном из стилей.
+
+    Конвейер состоит из трёх потоков: чтение кадров из cv2.VideoCapture,
+    преобразование кадра в стиль и отображение (главный поток). Потоки связаны
+    ограниченными очередями; если следующая стадия не успевает, самый старый кадр
+    в очереди выбрасывается, поэтому на экране всегда свежий кадр.
+
+    Args:
+        art_class (type): Класс стиля (ArtASCIIGray, ArtASCIIColor, ArtPixelGray, ArtPixelColor).
+        source (str or int): Путь к видеофайлу, устройство ('/dev/video0') или номер камеры.
+        queue_size (int): Размер очередей между стадиями (по умолчанию 2).
+        **art_kwargs: Дополнительные параметры стиля (pixel_size, font_size, color_lvl, screen_res).
+
+    Attributes:
+        art: Объект стиля, которым преобразуются кадры.
+        surface (pygame.Surface): Поверхность окна.
+        dropped_frames (int): Количество выброшенных кадров.
+    """
+    def __init__(self, art_class, source=0, queue_size=2, **art_kwargs):
+        if isinstance(source, str) and source.isdigit():
+            source = int(source)
+        self.source = source
+        self.art = art_class(None, **art_kwargs)
+        self.surface = self.art.surface
+        self.clock = self.art.clock
+        self.font = self.art.app.font(24)
+        self.frame_queue = queue.Queue(maxsize=queue_size)
+        self.converted_queue = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+        self.dropped_frames = 0
+        self.dropped_lock = threading.Lock()
+
+    def put_latest(self, target_queue, item):
+        """
+        Кладёт элемент в очередь, выбрасывая самый старый, если очередь заполнена.
+
+        Args:
+            target_queue (queue.Queue): Очередь стадии.
+            item: Кадр или готовая поверхность.
+        """
+        while True:
+            try:
+                target_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    target_queue.get_nowait()
+                    with self.dropped_lock:
+                        self.dropped_frames += 1
+                except queue.Empty:
+                    pass
+
+    def decode_frames(self, capture):
+        """
+        Читает кадры из источника и передаёт их на преобразование.
+
+        Для видеофайла чтение идёт со скоростью исходного FPS, для камеры — по мере готовности кадров.
+
+        Args:
+            capture (cv2.VideoCapture): Открытый источник видео.
+        """
+        is_file = not isinstance(self.source, int) and not str(self.source).startswith('/dev/')
+        source_fps = capture.get(cv2.CAP_PROP_FPS) if is_file else 0
+        frame_time = 1 / source_fps if source_fps and source_fps > 0 else 0
+        next_frame = time.perf_counter()
+        while not self.stop_event.is_set():
+            ok, frame = capture.read()
+            if not ok:
+                break
+            self.put_latest(self.frame_queue, frame)
+            if frame_time:
+                next_frame += frame_time
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_frame = time.perf_counter()
+        self.put_latest(self.frame_queue, None)
+
+    def convert_frames(self):
+        """
+        Преобразует кадры в выбранный стиль на отдельных поверхностях.
+        """
+        while not self.stop_event.is_set():
+            try:
+                frame = self.frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if frame is None:
+                break
+            self.art.surface = pg.Surface(self.art.RES)
+            self.art.set_frame(frame)
+            self.art.draw_converted_image()
+            self.put_latest(self.converted_queue, self.art.surface)
+        self.put_latest(self.converted_queue, None)
+
+    def draw_fps(self):
+        """
+        Отображает достигнутый FPS и число выброшенных кадров.
+        """
+        text = f"FPS: {self.clock.get_fps():.1f}  dropped: {self.dropped_frames}"
+        text_surface = self.font.render(text, True, (255, 255, 0), (0, 0, 0))
+        self.surface.blit(text_surface, (5, 5))
+
+    def run(self):
+        """
+        Запускает конвейер и цикл отображения.
+
+        Raises:
+            FileNotFoundError: Если источник видео не удалось открыть.
+
+        Example:
+            >>> app = VideoArt(ArtPixelColor, 'video/clip.mp4')
+            >>> app.run()
+        """
+        capture = cv2.VideoCapture(self.source)
+        if not capture.isOpened():
+            raise FileNotFoundError(f"Video source {self.source} could not be opened.")
+        threads = [threading.Thread(target=self.decode_frames, args=(capture,), daemon=True),
+                   threading.Thread(target=self.convert_frames, daemon=True)]
+        for thread in threads:
+            thread.start()
+        pg.display.set_caption("Видео")
+        running = True
+        while running:
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    running = False
+            try:
+                converted = self.converted_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if converted is None:
+                break
+            self.surface.blit(converted, (0, 0))
+            self.clock.tick()
+            self.draw_fps()
+            pg.display.flip()
+        self.stop_event.set()
+        for thread in threads:
+            thread.join()
+        capture.release()
+        self.art.surface = self.surface
+
+
+if __name__ == '__main__':
+    """
+        Запуск видеорежима из командной строки:
+        python video.py <файл|/dev/videoN|номер камеры> [ASCII|ASCII Color|PIXEL|PIXEL Color]
+    """
+    from styles import load_style
+
+    video_source = sys.argv[1] if len(sys.argv) > 1 else 0
+    style = sys.argv[2] if len(sys.argv) > 2 else 'PIXEL Color'
+    VideoArt(load_style(style), video_source).run()
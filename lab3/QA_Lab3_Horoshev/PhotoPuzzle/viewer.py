@@ -0,0 +1,193 @@
+import pygame as pg
+
+
+class ArtViewer:
+    """
+    Окно просмотра преобразованного изображения с изменением размера, масштабированием и панорамированием.
+
+    Преобразованное изображение рендерится один раз, после чего строится пирамида
+    уменьшенных копий (каждая следующая в 2 раза меньше). При изменении окна или масштаба
+    масштабируется только видимая часть подходящего уровня пирамиды, поэтому
+    повторное декодирование и преобразование не нужны, а кадр обновляется мгновенно.
+
+    Args:
+        art: Объект стиля (ArtASCII* или ArtPixel*) с загруженным изображением.
+        min_zoom (float): Минимальный масштаб относительно «вписанного» размера (по умолчанию 0.25).
+        max_zoom (float): Максимальный масштаб (по умолчанию 16).
+
+    Attributes:
+        pyramid (list): Уровни пирамиды (pygame.Surface), от исходного размера к меньшим.
+        zoom (float): Текущий масштаб.
+        center (list): Точка изображения (в координатах исходного размера) в центре окна.
+    """
+    MIN_LEVEL_SIZE = 64
+
+    def __init__(self, art, min_zoom=0.25, max_zoom=16):
+        self.art = art
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.pyramid = self.build_pyramid(art.render_converted_image())
+        self.base_width, self.base_height = self.pyramid[0].get_size()
+        self.zoom = 1.0
+        self.center = [self.base_width / 2, self.base_height / 2]
+        self.surface = art.app.display(art.RES, pg.RESIZABLE)
+        self.clock = art.clock
+
+    def build_pyramid(self, surface):
+        """
+        Строит пирамиду уменьшенных копий изображения.
+
+        Args:
+            surface (pygame.Surface): Преобразованное изображение.
+
+        Returns:
+            list: Уровни пирамиды.
+        """
+        pyramid = [surface.copy()]
+        while min(pyramid[-1].get_size()) // 2 >= self.MIN_LEVEL_SIZE:
+            width, height = pyramid[-1].get_size()
+            pyramid.append(pg.transform.smoothscale(pyramid[-1], (width // 2, height // 2)))
+        return pyramid
+
+    def scale(self):
+        """
+        Возвращает итоговый коэффициент масштабирования исходного изображения в окно.
+
+        Returns:
+            float: Коэффициент масштабирования.
+        """
+        width, height = self.surface.get_size()
+        return min(width / self.base_width, height / self.base_height) * self.zoom
+
+    def clamp_center(self):
+        """
+        Не даёт увести изображение за пределы окна при панорамировании.
+
+        Если изображение целиком помещается в окно, оно остаётся по центру.
+        """
+        if self.zoom <= 1:
+            self.center = [self.base_width / 2, self.base_height / 2]
+            return
+        self.center[0] = max(0, min(self.center[0], self.base_width))
+        self.center[1] = max(0, min(self.center[1], self.base_height))
+
+    def set_zoom(self, zoom, anchor=None):
+        """
+        Меняет масштаб, сохраняя точку под курсором на месте.
+
+        Args:
+            zoom (float): Новый масштаб.
+            anchor (tuple, optional): Точка окна, которая должна остаться на месте.
+        """
+        zoom = max(self.min_zoom, min(zoom, self.max_zoom))
+        if anchor is not None:
+            width, height = self.surface.get_size()
+            old_scale = self.scale()
+            image_x = self.center[0] + (anchor[0] - width / 2) / old_scale
+            image_y = self.center[1] + (anchor[1] - height / 2) / old_scale
+            self.zoom = zoom
+            new_scale = self.scale()
+            self.center = [image_x - (anchor[0] - width / 2) / new_scale,
+                           image_y - (anchor[1] - height / 2) / new_scale]
+        else:
+            self.zoom = zoom
+        self.clamp_center()
+
+    def pan(self, dx, dy):
+        """
+        Сдвигает изображение на заданное число пикселей окна.
+
+        Args:
+            dx (int): Сдвиг по X.
+            dy (int): Сдвиг по Y.
+        """
+        scale = self.scale()
+        self.center[0] -= dx / scale
+        self.center[1] -= dy / scale
+        self.clamp_center()
+
+    def draw(self):
+        """
+        Отрисовывает видимую часть изображения.
+
+        Выбирается наименьший уровень пирамиды, разрешение которого не меньше требуемого,
+        из него вырезается видимая область (subsurface, без копирования) и масштабируется до окна.
+        """
+        self.surface.fill('black')
+        width, height = self.surface.get_size()
+        scale = self.scale()
+        level = 0
+        while level + 1 < len(self.pyramid) and scale <= 0.5 ** (level + 1):
+            level += 1
+        level_surface = self.pyramid[level]
+        level_factor = level_surface.get_width() / self.base_width
+        # Видимая область в координатах исходного размера
+        left = self.center[0] - width / 2 / scale
+        top = self.center[1] - height / 2 / scale
+        view = pg.Rect(int(left * level_factor), int(top * level_factor),
+                       int(width / scale * level_factor) + 2, int(height / scale * level_factor) + 2)
+        source = view.clip(level_surface.get_rect())
+        if source.width <= 0 or source.height <= 0:
+            return
+        pixel_scale = scale / level_factor
+        dest_size = (max(1, round(source.width * pixel_scale)), max(1, round(source.height * pixel_scale)))
+        dest_pos = (round((source.x / level_factor - left) * scale), round((source.y / level_factor - top) * scale))
+        visible = level_surface.subsurface(source)
+        if pixel_scale >= 1:
+            # Увеличение без сглаживания сохраняет чёткие пиксели и символы
+            scaled = pg.transform.scale(visible, dest_size)
+        else:
+            scaled = pg.transform.smoothscale(visible, dest_size)
+        self.surface.blit(scaled, dest_pos)
+
+    def run(self):
+        """
+        Запускает цикл просмотра.
+
+        Управление: колесо мыши или +/- — масштаб, перетаскивание мышью или стрелки — сдвиг,
+        0 — исходный вид. Перерисовка выполняется только по событиям.
+        """
+        pg.display.set_caption("Обработанное изображение")
+        self.art.draw_cv2_image()
+        dragging = False
+        redraw = True
+        running = True
+        while running:
+            if redraw:
+                self.draw()
+                pg.display.flip()
+                redraw = False
+            for event in [pg.event.wait()] + pg.event.get():
+                if event.type == pg.QUIT:
+                    running = False
+                elif event.type in (pg.VIDEORESIZE, pg.WINDOWRESIZED, pg.WINDOWSIZECHANGED, pg.VIDEOEXPOSE):
+                    self.surface = pg.display.get_surface()
+                    redraw = True
+                elif event.type == pg.MOUSEWHEEL:
+                    self.set_zoom(self.zoom * (1.25 ** event.y), pg.mouse.get_pos())
+                    redraw = True
+                elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+                    dragging = True
+                elif event.type == pg.MOUSEBUTTONUP and event.button == 1:
+                    dragging = False
+                elif event.type == pg.MOUSEMOTION and dragging:
+                    self.pan(*event.rel)
+                    redraw = True
+                elif event.type == pg.KEYDOWN:
+                    redraw = True
+                    if event.key in (pg.K_PLUS, pg.K_EQUALS, pg.K_KP_PLUS):
+                        self.set_zoom(self.zoom * 1.25)
+                    elif event.key in (pg.K_MINUS, pg.K_KP_MINUS):
+                        self.set_zoom(self.zoom / 1.25)
+                    elif event.key == pg.K_0:
+                        self.zoom = 1.0
+                        self.center = [self.base_width / 2, self.base_height / 2]
+                    elif event.key == pg.K_LEFT:
+                        self.pan(50, 0)
+                    elif event.key == pg.K_RIGHT:
+                        self.pan(-50, 0)
+                    elif event.key == pg.K_UP:
+                        self.pan(0, 50)
+                    elif event.key == pg.K_DOWN:
+                        self.pan(0, -50)
+            self.clock.tick(60)
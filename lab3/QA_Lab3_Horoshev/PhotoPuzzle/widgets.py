@@ -0,0 +1,162 @@
+import pygame as pg
+
+
+class Button:
+    """
+    Кнопка с заранее отрендеренными поверхностями.
+
+    Фон, рамка и надпись рендерятся один раз при создании (в обычном и подсвеченном
+    состоянии), после чего отрисовка кнопки — это один blit.
+
+    Args:
+        text (str): Надпись на кнопке.
+        rect (tuple or pygame.Rect): Положение и размер кнопки.
+        font (pygame.font.Font): Шрифт надписи.
+        color (tuple): Цвет фона (по умолчанию (200, 200, 200)).
+        hover_color (tuple): Цвет фона под курсором (по умолчанию (170, 170, 170)).
+        border_color (tuple): Цвет рамки и текста (по умолчанию (0, 0, 0)).
+
+    Attributes:
+        hovered (bool): Находится ли курсор над кнопкой.
+    """
+    def __init__(self, text, rect, font, color=(200, 200, 200), hover_color=(170, 170, 170), border_color=(0, 0, 0)):
+        self.text = text
+        self.rect = pg.Rect(rect)
+        self.hovered = False
+        self.surfaces = {
+            False: self.render(font, color, border_color),
+            True: self.render(font, hover_color, border_color),
+        }
+
+    def render(self, font, color, border_color):
+        """
+        Рендерит поверхность кнопки.
+
+        Args:
+            font (pygame.font.Font): Шрифт надписи.
+            color (tuple): Цвет фона.
+            border_color (tuple): Цвет рамки и текста.
+
+        Returns:
+            pygame.Surface: Готовая поверхность кнопки.
+        """
+        surface = pg.Surface(self.rect.size)
+        surface.fill(color)
+        pg.draw.rect(surface, border_color, surface.get_rect(), 2)
+        text_surface = font.render(self.text, True, border_color)
+        surface.blit(text_surface, text_surface.get_rect(center=surface.get_rect().center))
+        return surface
+
+    def draw(self, surface):
+        """
+        Отрисовывает кнопку.
+
+        Args:
+            surface (pygame.Surface): Поверхность для отрисовки.
+
+        Returns:
+            pygame.Rect: Обновлённая область экрана.
+        """
+        surface.blit(self.surfaces[self.hovered], self.rect)
+        return self.rect
+
+    def set_hovered(self, hovered):
+        """
+        Меняет состояние подсветки.
+
+        Args:
+            hovered (bool): Находится ли курсор над кнопкой.
+
+        Returns:
+            bool: True, если состояние изменилось и кнопку нужно перерисовать.
+        """
+        if self.hovered == hovered:
+            return False
+        self.hovered = hovered
+        return True
+
+
+class WidgetLayer:
+    """
+    Слой виджетов с перерисовкой только изменившихся областей.
+
+    Экран целиком рисуется один раз (и при потере содержимого окна), дальше
+    по событиям перерисовываются только изменившиеся виджеты через pg.display.update(dirty_rects).
+
+    Args:
+        surface (pygame.Surface): Поверхность окна.
+        background (tuple): Цвет фона.
+
+    Attributes:
+        widgets (list): Виджеты слоя.
+    """
+    def __init__(self, surface, background):
+        self.surface = surface
+        self.background = background
+        self.widgets = []
+
+    def add(self, widget):
+        """
+        Добавляет виджет в слой.
+
+        Args:
+            widget (Button): Виджет.
+        """
+        self.widgets.append(widget)
+
+    def draw_all(self):
+        """
+        Полностью перерисовывает слой и обновляет весь экран.
+        """
+        self.surface.fill(self.background)
+        for widget in self.widgets:
+            widget.draw(self.surface)
+        pg.display.flip()
+
+    def widget_at(self, pos):
+        """
+        Возвращает виджет в указанной точке.
+
+        Args:
+            pos (tuple): Координаты точки.
+
+        Returns:
+            Button or None: Виджет или None.
+        """
+        for widget in self.widgets:
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+    def hover(self, pos):
+        """
+        Обновляет подсветку виджетов и перерисовывает изменившиеся.
+
+        Args:
+            pos (tuple): Координаты курсора.
+        """
+        dirty_rects = [widget.draw(self.surface) for widget in self.widgets
+                       if widget.set_hovered(widget.rect.collidepoint(pos))]
+        if dirty_rects:
+            pg.display.update(dirty_rects)
+
+    def wait_click(self):
+        """
+        Ожидает щелчка по виджету, не нагружая процессор между событиями.
+
+        Returns:
+            Button or None: Выбранный виджет или None, если окно закрыто.
+        """
+        self.draw_all()
+        while True:
+            event = pg.event.wait()
+            if event.type == pg.QUIT:
+                return None
+            if event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED, pg.WINDOWRESTORED):
+                self.draw_all()
+            elif event.type == pg.MOUSEMOTION:
+                self.hover(event.pos)
+            elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+                widget = self.widget_at(event.pos)
+                if widget is not None:
+                    return widget